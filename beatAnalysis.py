@@ -0,0 +1,148 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+from scipy.fft import next_fast_len
+from scipy.signal import find_peaks
+from scipy.signal.windows import blackmanharris
+
+from envelope import amplitude_envelope
+from pitchEstimation import parabolic_peak
+
+FRAME_CACHE_SIZE = 128   # Spectra kept per recording (~4 MB at a 16384-point FFT)
+DB_RANGE = 60            # Spectra are normalised to 0 dB and clipped here
+
+
+class FrameSpectrumCache:
+    """Per-frame dB spectra of a recording on a fixed hop grid, computed lazily.
+
+    A playback position is snapped to the frame starting at the nearest
+    hop, so repeated or nearby positions reuse one FFT. The window, the
+    frequency vector and the most recent spectra (LRU) are kept, and each
+    spectrum is stored with its peaks so find_peaks also runs once per
+    frame.
+    """
+
+    def __init__(self, audio, fs, frame_size, fft_size, hop=None, cache_size=FRAME_CACHE_SIZE):
+        self.audio = audio
+        self.fs = fs
+        self.frame_size = frame_size
+        self.fft_size = max(fft_size, frame_size)
+        self.hop = hop or max(1, frame_size // 4)
+        self.window = blackmanharris(frame_size)
+        self.freqs = np.fft.rfftfreq(self.fft_size, 1 / fs)
+        self.n_frames = max(0, (len(audio) - frame_size) // self.hop + 1)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def frame_index(self, seconds):
+        """Index of the grid frame for a playback time, or None past the last full frame"""
+        index = int(round(seconds * self.fs / self.hop))
+        return index if 0 <= index < self.n_frames else None
+
+    def compute(self, index):
+        start = index * self.hop
+        frame = self.audio[start:start + self.frame_size] * self.window
+        mag_db = 20 * np.log10(np.abs(np.fft.rfft(frame, n=self.fft_size)) + 1e-8)
+        mag_db -= np.max(mag_db)  # Normalize so 0 dB is peak
+        np.clip(mag_db, -DB_RANGE, 0, out=mag_db)
+        peaks, _ = find_peaks(mag_db, height=-40, prominence=6, width=2)
+        return mag_db.astype(np.float32), peaks
+
+    def spectrum(self, index):
+        """(mag_db, peak_indices) of frame `index`"""
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+        result = self.compute(index)
+        self._cache[index] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+
+ENVELOPE_RATE = 200      # Hz; the envelope is block-averaged down to this rate
+MAX_BEAT_HZ = 20         # Faster amplitude fluctuations are heard as roughness, not beats
+MIN_BEAT_HZ = 0.3
+BEAT_RESOLUTION_HZ = 0.02
+N_PARTIALS = 24
+
+
+def envelope_spectrum(audio, fs, resolution=BEAT_RESOLUTION_HZ, envelope_rate=ENVELOPE_RATE):
+    """Low-frequency magnitude spectrum of the amplitude envelope.
+
+    The Hilbert envelope is averaged in blocks down to ~envelope_rate Hz,
+    its mean removed and Hann-windowed, then zero-padded so the spectrum
+    is sampled every `resolution` Hz. Returns (freqs, magnitude).
+    """
+    env = amplitude_envelope(audio, fs, 'Hilbert', 0)
+    block = max(1, int(fs // envelope_rate))
+    n_blocks = len(env) // block
+    env = env[:n_blocks * block].reshape(n_blocks, block).mean(axis=1)
+    rate = fs / block
+
+    env = (env - env.mean()) * np.hanning(len(env))
+    n_fft = next_fast_len(max(len(env), int(np.ceil(rate / resolution))))
+    magnitude = np.abs(np.fft.rfft(env, n_fft)) / max(1, len(env))
+    return np.fft.rfftfreq(n_fft, 1 / rate), magnitude
+
+
+def spectral_partials(audio, fs, n_partials=N_PARTIALS, fmin=30.0, fmax=10000.0):
+    """Frequencies (sub-bin) and levels (dB) of the strongest spectral peaks of the whole recording"""
+    n_fft = next_fast_len(len(audio))
+    mag_db = 20 * np.log10(np.abs(np.fft.rfft(audio * np.hanning(len(audio)), n_fft)) + 1e-12)
+    freqs = np.fft.rfftfreq(n_fft, 1 / fs)
+    lo = max(1, int(np.searchsorted(freqs, fmin)))
+    hi = min(len(freqs) - 1, int(np.searchsorted(freqs, fmax)))
+
+    peaks, _ = find_peaks(mag_db[lo:hi], prominence=10, height=np.max(mag_db) - 60)
+    peaks = peaks[np.argsort(mag_db[lo:hi][peaks])[::-1][:n_partials]] + lo
+    # One spectrum shared by every peak: a broadcast view, not a copy per row
+    position, level = parabolic_peak(np.broadcast_to(mag_db, (len(peaks), len(mag_db))), peaks)
+    bin_width = freqs[1] - freqs[0]
+    order = np.argsort(position)
+    return position[order] * bin_width, level[order]
+
+
+def estimate_beats(audio, fs, max_beat=MAX_BEAT_HZ, n_partials=N_PARTIALS, n_beats=5):
+    """Measure beat rates and the pairs of partials that explain them.
+
+    Beat rates are the strongest peaks of the envelope spectrum between
+    MIN_BEAT_HZ and max_beat. Every pair of spectral partials is compared
+    at once (np.subtract.outer) and a pair is kept for a beat when its
+    frequency difference matches the rate within two envelope bins.
+    Returns {'beats': [(rate, strength)], 'pairs': [(f_low, f_high, diff, rate)],
+    'elapsed': seconds} with strengths relative to the strongest beat.
+    """
+    start = time.perf_counter()
+    audio = np.asarray(audio, dtype=np.float64)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+
+    freqs, magnitude = envelope_spectrum(audio, fs)
+    band = (freqs >= MIN_BEAT_HZ) & (freqs <= max_beat)
+    band_freqs, band_mag = freqs[band], magnitude[band]
+    peaks, _ = find_peaks(band_mag, prominence=0.1 * np.max(band_mag) if len(band_mag) else 0)
+    peaks = peaks[np.argsort(band_mag[peaks])[::-1][:n_beats]]
+    rates = band_freqs[peaks]
+    strengths = band_mag[peaks] / band_mag[peaks].max() if len(peaks) else band_mag[peaks]
+
+    # Two envelope bins plus the width of a partial's peak
+    tolerance = 2 * (freqs[1] - freqs[0]) + 2 * fs / len(audio)
+
+    partials, _ = spectral_partials(audio, fs, n_partials)
+    diffs = np.subtract.outer(partials, partials)          # diffs[i, j] = f_i - f_j
+    high, low = np.nonzero((diffs > 0) & (diffs <= max_beat + tolerance))
+    pair_diffs = diffs[high, low]
+
+    # Match every beat rate against every pair in one comparison
+    matches = np.abs(pair_diffs[None, :] - rates[:, None]) <= tolerance
+    beat_index, pair_index = np.nonzero(matches)
+    pairs = [(float(partials[low[p]]), float(partials[high[p]]), float(pair_diffs[p]), float(rates[b]))
+             for b, p in zip(beat_index, pair_index)]
+
+    return {
+        'beats': [(float(r), float(s)) for r, s in zip(rates, strengths)],
+        'pairs': pairs,
+        'elapsed': time.perf_counter() - start
+    }
@@ -0,0 +1,306 @@
+"""Startup and import-time benchmark for sigvisqt.
+
+Measures, headless (QT_QPA_PLATFORM=offscreen):
+  - interpreter start to first paint of the main window, over several runs,
+    and which of HEAVY_MODULES were already imported by then
+  - per-module import cost from `python -X importtime -c "import sigvisqt"`
+  - per-page import and construction time and RSS, each page in a fresh process
+
+Usage:
+  python benchmarkStartup.py [--runs 5] [--output results.json]
+  python benchmarkStartup.py --compare old.json new.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from config import BENCHMARK_ENV
+
+MARKER = 'SIGVIS_BENCH '   # Prefix of the JSON line a child process reports
+TOP_MODULES = 30           # Modules kept from the importtime breakdown
+TIMEOUT_S = 120            # Per child process; a page left waiting on a dialog is killed
+MODAL_POLL_MS = 100        # How often the page child looks for a modal dialog to close
+# Heavy imports that should stay out of startup; reported if loaded by first paint
+HEAVY_MODULES = ('PyQt5.QtWebEngineWidgets', 'numpy', 'scipy', 'matplotlib',
+                 'librosa', 'pandas', 'sounddevice', 'pyaudio')
+
+
+def rss_mb():
+    """Resident set size of this process in MB (peak if the current value is unavailable)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kB on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return None
+
+
+def emit(result):
+    print(MARKER + json.dumps(result), flush=True)
+
+
+def bench_env():
+    env = dict(os.environ)
+    env['QT_QPA_PLATFORM'] = 'offscreen'
+    env[BENCHMARK_ENV] = '1'
+    return env
+
+
+def run_child(args):
+    """Run this script in a child mode and return the JSON it reported"""
+    cmd = [sys.executable, str(Path(__file__).resolve())] + args
+    try:
+        proc = subprocess.run(cmd, cwd=HERE, env=bench_env(), capture_output=True,
+                              text=True, timeout=TIMEOUT_S)
+    except subprocess.TimeoutExpired:
+        return {'error': f"timed out after {TIMEOUT_S} s"}
+    for line in proc.stdout.splitlines():
+        if line.startswith(MARKER):
+            return json.loads(line[len(MARKER):])
+    return {'error': (proc.stderr.strip().splitlines() or ['no result'])[-1]}
+
+
+### Child modes (run in a fresh interpreter) ###
+
+def child_app():
+    """Build the main window and report when the event loop has painted it"""
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    import sigvisqt
+
+    app = QApplication(sys.argv)
+    window = sigvisqt.Start()
+    window.show()
+
+    def painted():
+        emit({'first_paint_wall': time.time(), 'rss_mb': rss_mb(),
+              'heavy_modules': [m for m in HEAVY_MODULES if m in sys.modules]})
+        app.quit()
+
+    QTimer.singleShot(0, painted)
+    app.exec_()
+
+
+def child_page(page_name):
+    """Import and construct one page on top of a bare main window"""
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    import importlib
+    import sigvisqt
+
+    app = QApplication(sys.argv)
+    window = sigvisqt.Start()
+    window.show()
+    app.processEvents()
+    base_rss = rss_mb()
+
+    # Pages skip their modal boxes under BENCHMARK_ENV; any other modal dialog
+    # is closed from its own event loop (its wait counts in construct_s)
+    modal_dialogs = []
+
+    def close_modal():
+        dialog = app.activeModalWidget()
+        if dialog is not None:
+            modal_dialogs.append(dialog.windowTitle())
+            dialog.close()
+
+    modal_timer = QTimer()
+    modal_timer.timeout.connect(close_modal)
+    modal_timer.start(MODAL_POLL_MS)
+
+    module_name, _ = sigvisqt.PAGES[page_name]
+    try:
+        start = time.perf_counter()
+        importlib.import_module(module_name)
+        import_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        window.initialize_frame(page_name)
+        app.processEvents()
+        construct_s = time.perf_counter() - start
+    except Exception as e:
+        emit({'error': f"{type(e).__name__}: {e}"})
+        return
+
+    frame = window.frames.get(page_name)
+    if frame is not None and hasattr(frame, 'cleanup'):
+        frame.cleanup()
+    end_rss = rss_mb()
+    emit({
+        'import_s': import_s,
+        'construct_s': construct_s,
+        'rss_mb': end_rss,
+        'rss_delta_mb': end_rss - base_rss if end_rss is not None and base_rss is not None else None,
+        'modal_dialogs': modal_dialogs
+    })
+
+
+### Measurements ###
+
+def measure_first_paint(runs):
+    times = []
+    rss = []
+    errors = []
+    heavy = set()
+    for _ in range(runs):
+        start = time.time()
+        result = run_child(['--child', 'app'])
+        if 'error' in result:
+            errors.append(result['error'])
+            continue
+        times.append(result['first_paint_wall'] - start)
+        rss.append(result['rss_mb'])
+        heavy.update(result.get('heavy_modules', []))
+    summary = {'runs': times, 'errors': errors, 'heavy_modules': sorted(heavy)}
+    if times:
+        summary.update(median_s=statistics.median(times), min_s=min(times),
+                       rss_mb=statistics.median([r for r in rss if r is not None] or [0]))
+    return summary
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into {module: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+def measure_imports(top=TOP_MODULES):
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import sigvisqt'],
+                          cwd=HERE, env=bench_env(), capture_output=True, text=True,
+                          timeout=TIMEOUT_S)
+    modules = parse_importtime(proc.stderr)
+    if proc.returncode != 0 or not modules:
+        return {'error': (proc.stderr.strip().splitlines() or ['no output'])[-1]}
+
+    # Top-level packages (numpy, scipy, PyQt5...) add up their own modules
+    packages = {}
+    for name, (self_us, _) in modules.items():
+        root = name.split('.')[0]
+        packages[root] = packages.get(root, 0) + self_us
+
+    by_cumulative = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    by_package = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'total_s': modules.get('sigvisqt', (0, 0))[1] / 1e6,
+        'modules': [{'name': n, 'self_s': s / 1e6, 'cumulative_s': c / 1e6} for n, (s, c) in by_cumulative],
+        'packages': [{'name': n, 'self_s': s / 1e6} for n, s in by_package]
+    }
+
+
+def measure_pages():
+    from sigvisqt import PAGES
+    return {name: run_child(['--child', 'page', name]) for name in PAGES}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_benchmark(runs):
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'first_paint': measure_first_paint(runs),
+        'imports': measure_imports(),
+        'pages': measure_pages()
+    }
+
+
+### Comparison ###
+
+def change(old, new):
+    def value(v):
+        return f"{v:10.3f}" if v is not None else f"{'-':>10}"
+    ratio = f"{(new - old) / old * 100:+.0f}%" if old and new is not None else ''
+    return f"{value(old)} {value(new)} {ratio:>8}"
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    print(f"{'':28} {old.get('revision') or 'old':>10} {new.get('revision') or 'new':>10}")
+    print(f"{'First paint (s)':28} {change(old['first_paint'].get('median_s'), new['first_paint'].get('median_s'))}")
+    print(f"{'First paint RSS (MB)':28} {change(old['first_paint'].get('rss_mb'), new['first_paint'].get('rss_mb'))}")
+    print(f"{'import sigvisqt (s)':28} {change(old['imports'].get('total_s'), new['imports'].get('total_s'))}")
+    for label, result in (('old', old), ('new', new)):
+        heavy = result['first_paint'].get('heavy_modules')
+        loaded = ', '.join(heavy) if heavy else ('none' if heavy is not None else 'not recorded')
+        print(f"{'Heavy modules at paint, ' + label:28} {loaded}")
+    for page in sorted(set(old['pages']) | set(new['pages'])):
+        a = old['pages'].get(page, {})
+        b = new['pages'].get(page, {})
+        print(f"{page + ' import (s)':28} {change(a.get('import_s'), b.get('import_s'))}")
+        print(f"{page + ' construct (s)':28} {change(a.get('construct_s'), b.get('construct_s'))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='first-paint repetitions')
+    parser.add_argument('--output', help='JSON file for the results (default: benchmarks/startup-<time>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files')
+    parser.add_argument('--child', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        if args.child[0] == 'app':
+            child_app()
+        else:
+            child_page(args.child[1])
+        return
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = run_benchmark(args.runs)
+    output = Path(args.output) if args.output else \
+        HERE / 'benchmarks' / f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    paint = results['first_paint']
+    if 'median_s' in paint:
+        print(f"First paint: {paint['median_s']:.2f} s median of {len(paint['runs'])}, "
+              f"{paint['rss_mb']:.0f} MB")
+    for error in paint['errors']:
+        print(f"First paint run failed: {error}")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
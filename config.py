@@ -16,6 +16,11 @@ BASE_DIR = get_base_path()
 RECORDINGS_DIR = BASE_DIR / "recordings"
 LIBRARY_DIR = BASE_DIR / "library"
 
+# Set by benchmarkStartup.py, or by hand to get the cold-start report on the
+# console: modal dialogs (welcome, missing audio device) are skipped so runs
+# are unattended
+BENCHMARK_ENV = 'SIGVIS_BENCHMARK'
+
 # Create directories if they don't exist
 RECORDINGS_DIR.mkdir(exist_ok=True)
 LIBRARY_DIR.mkdir(exist_ok=True)
\ No newline at end of file
@@ -19,6 +19,12 @@ from pitchAdvancedSettings import AdvancedSettings
 from PyQt5.QtWidgets import QVBoxLayout
 from scipy.io.wavfile import write
 from help import Help
+from filterDesign import design_sos
+from fftFilter import ENGINES, design_fir, choose_engine, filter_signal, filter_file
+from harmonicBank import harmonic_bank, harmonic_masks
+from liveAnalysis import LiveAnalysisWindow
+from envelope import ENVELOPES, amplitude_envelope, decimate_for_display
+from frameFeatures import short_time_energy_db, spectral_centroid
 from pathlib import Path
 import time
 import matplotlib.gridspec as gridspec
@@ -27,9 +33,6 @@ from matplotlib.widgets import SpanSelector
 from matplotlib import patches
 
 
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
 import os
 
 
@@ -59,6 +62,7 @@ class ControlMenu(QDialog):
         self.setAttribute(Qt.WA_DeleteOnClose)
 
         self.plot_windows = []  # Track all plot windows
+        self.live_windows = []  # Live microphone views
         self.selected_span = None  # Track span selection times
 
         self.audio_player = None
@@ -80,7 +84,7 @@ class ControlMenu(QDialog):
         self.method_selector = QComboBox()
         self.method_selector.addItems([
             'Waveform', 'Fourier Transform', 'Short Time Fourier Transform', 'Spectrogram', 'STFT + Spect', 
-            'Short-Time-Energy', 'Pitch', 'Spectral Centroid', 'Filtering'
+            'Short-Time-Energy', 'Envelope', 'Pitch', 'Spectral Centroid', 'Filtering'
         ])
         self.method_selector.setCurrentText('Spectrogram')
         self.method_selector.currentTextChanged.connect(self.update_ui_state)
@@ -120,6 +124,11 @@ class ControlMenu(QDialog):
         self.save_button = QPushButton('Save to Excel')
         self.save_button.clicked.connect(self.save_to_excel)
         main_layout.addWidget(self.save_button, 14, 0, 1, 1)
+
+        # STE, spectral centroid and pitch of the microphone, updated as it records
+        self.live_mic_button = QPushButton('Live Microphone')
+        self.live_mic_button.clicked.connect(self.open_live_microphone)
+        main_layout.addWidget(self.live_mic_button, 15, 0, 1, 1)
         
         # Add font controls to the right of help button
         font_container = QWidget()
@@ -447,7 +456,7 @@ class ControlMenu(QDialog):
         grid = QGridLayout()
         
         self.filter_type = QComboBox()
-        self.filter_type.addItems(['Harmonic', 'Lowpass', 'Highpass', 'Bandpass', 'Bandstop'])
+        self.filter_type.addItems(['Harmonic', 'Lowpass', 'Highpass', 'Bandpass', 'Bandstop', 'Harmonic bank'])
         self.filter_type.currentTextChanged.connect(self.update_filter_ui)
         
         self.fund_freq = QLineEdit("1")
@@ -488,21 +497,54 @@ class ControlMenu(QDialog):
         grid.addWidget(self.vis_type_label, 7, 0)
         grid.addWidget(self.waveform_radio, 7, 1)
         grid.addWidget(self.spectrogram_radio, 8, 1)
+
+        # Forward-backward filtering cancels the phase response
+        self.zero_phase = QCheckBox("Zero phase")
+        self.zero_phase.setToolTip("Filter forwards and backwards (no phase distortion, squared magnitude)")
+        grid.addWidget(self.zero_phase, 9, 0, 1, 2)
+
+        # IIR sections or an FFT overlap-add FIR; 'Auto' picks the cheaper one
+        self.filter_engine = QComboBox()
+        self.filter_engine.addItems(ENGINES)
+        self.filter_engine.setToolTip("Auto chooses IIR or FFT convolution by expected cost per sample")
+        grid.addWidget(QLabel("Engine:"), 10, 0)
+        grid.addWidget(self.filter_engine, 10, 1)
+
+        self.filter_file_button = QPushButton("Filter File...")
+        self.filter_file_button.setToolTip("Filter an audio file block by block and write the result to disk")
+        self.filter_file_button.clicked.connect(self.filter_audio_file)
+        grid.addWidget(self.filter_file_button, 11, 0, 1, 2)
+
+        # Harmonic bank: split into the first N harmonics of 'Center freq' at once
+        self.n_harmonics = QSpinBox()
+        self.n_harmonics.setRange(1, 12)
+        self.n_harmonics.setValue(6)
+        self.estimate_f0 = QCheckBox("Estimate f0")
+        self.estimate_f0.setToolTip("Use the median pitch of the signal instead of 'Center freq'")
+        grid.addWidget(QLabel("Harmonics:"), 12, 0)
+        grid.addWidget(self.n_harmonics, 12, 1)
+        grid.addWidget(self.estimate_f0, 13, 0, 1, 2)
         
         group.setLayout(grid)
         layout.addWidget(group, 1, 2, 7, 2)
         
     def update_filter_ui(self, filter_type):
         harmonic = filter_type == 'Harmonic'
+        bank = filter_type == 'Harmonic bank'
         lphp = filter_type in ['Lowpass', 'Highpass']
         bpbs = filter_type in ['Bandpass', 'Bandstop']
         
         self.fund_freq.setEnabled(harmonic)
-        self.center_freq.setEnabled(harmonic)
-        self.percentage.setEnabled(True)
+        self.center_freq.setEnabled(harmonic or bank)
+        self.percentage.setEnabled(not bank)
         self.fcut.setEnabled(lphp)
         self.fcut1.setEnabled(bpbs)
         self.fcut2.setEnabled(bpbs)
+        self.n_harmonics.setEnabled(bank)
+        self.estimate_f0.setEnabled(bank)
+        self.zero_phase.setEnabled(not bank)
+        self.filter_engine.setEnabled(not bank)
+        self.filter_file_button.setEnabled(not bank)
         
     def create_ste_group(self, layout):
         group = QGroupBox("Short-Time Energy")
@@ -512,6 +554,12 @@ class ControlMenu(QDialog):
         
         grid.addWidget(QLabel("Beta:"), 0, 0)
         grid.addWidget(self.beta, 0, 1)
+
+        # Amplitude envelope (smoothed over the window size)
+        self.envelope_type = QComboBox()
+        self.envelope_type.addItems(ENVELOPES)
+        grid.addWidget(QLabel("Envelope:"), 1, 0)
+        grid.addWidget(self.envelope_type, 1, 1)
         
         group.setLayout(grid)
         layout.addWidget(group, 9, 2, 5, 2)
@@ -534,6 +582,7 @@ class ControlMenu(QDialog):
         spectrogram_enabled = method == 'Spectrogram'
         stft_spect_enabled = method == 'STFT + Spect'
         ste_enabled = method == 'Short-Time-Energy'
+        envelope_enabled = method == 'Envelope'
         pitch_enabled = method == 'Pitch'
         spectral_centroid_enabled = method == 'Spectral Centroid'
         filtering_enabled = method == 'Filtering'
@@ -563,6 +612,8 @@ class ControlMenu(QDialog):
             (filtering_enabled and hasattr(self, 'waveform_radio') and not self.waveform_radio.isChecked()))
 
         
+        self.envelope_type.setEnabled(envelope_enabled)
+
         # STE controls
         if ste_enabled and self.window_type.currentText() == 'Kaiser':
             self.beta.setEnabled(True)
@@ -583,16 +634,45 @@ class ControlMenu(QDialog):
         self.fcut.setEnabled(False)
         self.fcut1.setEnabled(False)
         self.fcut2.setEnabled(False)
+        self.n_harmonics.setEnabled(False)
+        self.estimate_f0.setEnabled(False)
 
         if hasattr(self, 'waveform_radio'):  # Check if radio buttons exist
             self.waveform_radio.setEnabled(filtering_enabled)
             self.spectrogram_radio.setEnabled(filtering_enabled)
+            self.zero_phase.setEnabled(filtering_enabled)
+            self.filter_engine.setEnabled(filtering_enabled)
+            self.filter_file_button.setEnabled(filtering_enabled)
         
         if filtering_enabled:
             self.update_filter_ui(self.filter_type.currentText())
         
         self.filter_response_button.setEnabled(filtering_enabled)
 
+    def open_live_microphone(self):
+        """Open a live STE / spectral centroid / pitch view using the current analysis settings"""
+        try:
+            wind_size_samples = int(float(self.window_size.text()) * self.fs)
+            hop_size = wind_size_samples - int(float(self.overlap.text()) * self.fs)
+            if wind_size_samples <= 0 or hop_size <= 0:
+                raise ValueError("Window size must be positive and larger than the overlap")
+            window = self.get_window(wind_size_samples)
+            nfft = int(self.nfft.currentText())
+            min_pitch = float(self.min_pitch.text())
+            max_pitch = float(self.max_pitch.text())
+            _, max_freq = self.get_freq_bounds()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Invalid analysis parameters: {str(e)}")
+            return
+
+        live_window = LiveAnalysisWindow(self, self.fs, window, hop_size, nfft,
+                                         min_pitch, max_pitch, min(max_freq, self.fs / 2))
+        # Kept apart from plot_windows: it has no figure, span or playback to sync
+        self.live_windows.append(live_window)
+        live_window.finished.connect(lambda: self.live_windows.remove(live_window)
+                                     if live_window in self.live_windows else None)
+        live_window.show()
+
     def get_freq_bounds(self):
         try:
             min_freq = float(self.min_freq.text())
@@ -624,6 +704,8 @@ class ControlMenu(QDialog):
                 self.plot_stft_spect()
             elif method == 'Short-Time-Energy':
                 self.plot_ste()
+            elif method == 'Envelope':
+                self.plot_envelope()
             elif method == 'Pitch':
                 self.plot_pitch()
             elif method == 'Spectral Centroid':
@@ -1751,8 +1833,7 @@ class ControlMenu(QDialog):
         time_points = []
         for i in range(0, len(self.audio) - wind_size_samples, hop_size):
             segment = self.audio[i:i+wind_size_samples] * window
-            energy = 10 * np.log10(np.mean(segment**2) + 1e-12)
-            ste.append(energy)
+            ste.append(float(short_time_energy_db(segment)))
             time_points.append(self.time[i + wind_size_samples//2])
         
         # Plot original waveform
@@ -1822,6 +1903,37 @@ class ControlMenu(QDialog):
         self.show_plot_window(self.current_figure, ax[0], self.audio)
 
 
+    # Envelope
+
+    def plot_envelope(self):
+        fontsize = getattr(self, 'current_font_size', 12)
+
+        plt.style.use('default')
+        plt.rcParams.update({'font.size': fontsize})
+
+        method = self.envelope_type.currentText()
+        wind_size = float(self.window_size.text())
+
+        self.current_figure, ax = plt.subplots(2, figsize=(12, 6), sharex=True)
+        self.current_figure.suptitle(f'Amplitude Envelope ({method})')
+        for a in ax:
+            a.label_outer()
+
+        # Linear-time envelope, decimated to screen resolution for drawing
+        env = amplitude_envelope(self.audio, self.fs, method, wind_size)
+
+        ax[0].plot(self.time, self.audio)
+        ax[0].set(ylabel='Amplitude')
+        ax[1].plot(*decimate_for_display(self.time, env), color='blue', linewidth=1.2)
+        ax[1].set(xlim=[0, self.duration], xlabel='Time (s)', ylabel='Envelope')
+
+        def format_time_amp(x, y):
+            return f"time = {x:.2f} s, amplitude = {y:.3f}"
+        ax[0].format_coord = format_time_amp
+        ax[1].format_coord = format_time_amp
+
+        self.show_plot_window(self.current_figure, ax[0], self.audio)
+
     # Spectral Centroid
 
     def plot_spectral_centroid(self):
@@ -1868,10 +1980,7 @@ class ControlMenu(QDialog):
         self.show_plot_window(self.current_figure, ax1, self.audio)
 
     def calculate_sc(self, segment):
-        magnitudes = np.abs(np.fft.rfft(segment))
-        freqs = np.fft.rfftfreq(len(segment), 1/self.fs)
-        magnitudes = magnitudes ** 2
-        return np.sum(magnitudes * freqs) / np.sum(magnitudes)
+        return float(spectral_centroid(segment, self.fs))
 
     def on_sc_window_click(self, event, ax1, ax2, ax3, cax, draw_style, min_freq, max_freq, nfft):
         """Handle ONLY simple clicks for spectral centroid window movement"""
@@ -1976,81 +2085,105 @@ class ControlMenu(QDialog):
 
     # Filtered section.
 
+    def filter_params(self):
+        """Return (filter_type, percentage, edges) for the current filter settings"""
+        filter_type = self.filter_type.currentText()
+        percentage = float(self.percentage.text())
+
+        if filter_type in ('Lowpass', 'Highpass'):
+            edges = {'fcut': float(self.fcut.text())}
+        elif filter_type == 'Harmonic':
+            edges = {'fund_freq': float(self.fund_freq.text()),
+                     'center_freq': float(self.center_freq.text())}
+        else:  # Bandpass or Bandstop
+            edges = {'fcut1': float(self.fcut1.text()), 'fcut2': float(self.fcut2.text())}
+        return filter_type, percentage, edges
+
+    def design_filter(self):
+        """Return the (cached) SOS design for the current filter settings"""
+        filter_type, percentage, edges = self.filter_params()
+        return design_sos(filter_type, self.fs, percentage, **edges)
+
+    def selected_engine(self):
+        """Resolve the engine combo to 'iir' or 'fft' for the current design"""
+        engine = self.filter_engine.currentText()
+        if engine == 'IIR (SOS)':
+            return 'iir'
+        if engine == 'FIR (FFT)':
+            return 'fft'
+        filter_type, percentage, edges = self.filter_params()
+        return choose_engine(self.design_filter(),
+                             design_fir(filter_type, self.fs, percentage, **edges),
+                             self.zero_phase.isChecked())
+
     def plot_filter_response(self):
-            filter_type = self.filter_type.currentText()
-            percentage = float(self.percentage.text())
-            
-            if filter_type == 'Lowpass' or filter_type == 'Highpass':
-                fcut = float(self.fcut.text())
-                delta = fcut * (percentage / 100)
-                
-                if filter_type == 'Lowpass':
-                    wp = fcut - delta
-                    ws = fcut + delta
-                else:
-                    wp = fcut + delta
-                    ws = fcut - delta
-                    
-                N, Wn = signal.ellipord(wp, ws, 3, 40, fs=self.fs)
-                b, a = signal.ellip(N, 0.1, 40, Wn, btype=filter_type.lower(), fs=self.fs)
-                
-            elif filter_type == 'Harmonic':
-                fund_freq = float(self.fund_freq.text())
-                center_freq = float(self.center_freq.text())
-                fc = fund_freq * center_freq
-                fcut1 = fc - center_freq/2
-                fcut2 = fc + center_freq/2
-                delta1 = fcut1 * (percentage / 100)
-                delta2 = fcut2 * (percentage / 100)
-                
-                wp1 = fcut1 + delta1
-                wp2 = fcut2 - delta2
-                ws1 = fcut1 - delta1
-                ws2 = fcut2 + delta2
-                
-                N, Wn = signal.ellipord([wp1, wp2], [ws1, ws2], 3, 40, fs=self.fs)
-                b, a = signal.ellip(N, 0.1, 40, Wn, btype='bandpass', fs=self.fs)
-                
-            else:  # Bandpass or Bandstop
-                fcut1 = float(self.fcut1.text())
-                fcut2 = float(self.fcut2.text())
-                delta1 = fcut1 * (percentage / 100)
-                delta2 = fcut2 * (percentage / 100)
-                
-                if filter_type == 'Bandpass':
-                    wp1 = fcut1 + delta1
-                    wp2 = fcut2 - delta2
-                    ws1 = fcut1 - delta1
-                    ws2 = fcut2 + delta2
-                else:
-                    wp1 = fcut1 - delta1
-                    wp2 = fcut2 + delta2
-                    ws1 = fcut1 + delta1
-                    ws2 = fcut2 - delta2
-                    
-                N, Wn = signal.ellipord([wp1, wp2], [ws1, ws2], 3, 40, fs=self.fs)
-                b, a = signal.ellip(N, 0.1, 40, Wn, btype=filter_type.lower(), fs=self.fs)
-            
-            w, h = signal.freqz(b, a, worN=8000, fs=self.fs)
-            phase = np.unwrap(np.angle(h))
-            
-            self.current_figure, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
-            self.current_figure.suptitle(f'Filter Frequency Response ({filter_type})')
-            
-            ax1.plot(w, 20 * np.log10(abs(h)))
-            ax1.set_title('Magnitude Response')
-            ax1.set_ylabel('Amplitude [dB]')
-            ax1.set_xlabel('Frequency [Hz]')
-            ax1.grid(True)
-            
-            ax2.plot(w, phase)
-            ax2.set_title('Phase Response')
-            ax2.set_ylabel('Phase [radians]')
-            ax2.set_xlabel('Frequency [Hz]')
-            ax2.grid(True)
-            
-            plt.tight_layout()
-            plt.show()
+        if self.filter_type.currentText() == 'Harmonic bank':
+            self.plot_bank_response()
+            return
+
+        filter_type, percentage, edges = self.filter_params()
+        zero_phase = self.zero_phase.isChecked()
+
+        if self.selected_engine() == 'fft':
+            taps = design_fir(filter_type, self.fs, percentage, **edges)
+            w, h = signal.freqz(taps, worN=8000, fs=self.fs)
+            if zero_phase:
+                # Linear phase with the group delay removed
+                h = np.abs(h)
+                phase = np.zeros_like(w)
+            else:
+                phase = np.unwrap(np.angle(h))
+            description = f'FIR, {len(taps)} taps'
+        else:
+            sos = self.design_filter()
+            w, h = signal.sosfreqz(sos, worN=8000, fs=self.fs)
+            if zero_phase:
+                # Forward-backward filtering: squared magnitude, no phase shift
+                h = np.abs(h) ** 2
+                phase = np.zeros_like(w)
+            else:
+                phase = np.unwrap(np.angle(h))
+            description = f'IIR, {len(sos)} sections'
+
+        self.current_figure, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
+        self.current_figure.suptitle(f'Filter Frequency Response ({filter_type}, {description})')
+
+        ax1.plot(w, 20 * np.log10(np.maximum(abs(h), 1e-12)))
+        ax1.set_title('Magnitude Response')
+        ax1.set_ylabel('Amplitude [dB]')
+        ax1.set_xlabel('Frequency [Hz]')
+        ax1.grid(True)
+
+        ax2.plot(w, phase)
+        ax2.set_title('Phase Response')
+        ax2.set_ylabel('Phase [radians]')
+        ax2.set_xlabel('Frequency [Hz]')
+        ax2.grid(True)
+
+        plt.tight_layout()
+        plt.show()
+
+    def filter_audio_file(self):
+        """Filter a file on disk with the current settings, streaming it block by block"""
+        in_path, _ = QFileDialog.getOpenFileName(self, "Select Audio File to Filter", "",
+                                                 "Audio Files (*.wav *.flac *.ogg)")
+        if not in_path:
+            return
+        stem = Path(in_path).with_suffix('')
+        out_path, _ = QFileDialog.getSaveFileName(self, "Save Filtered Audio", f"{stem}_filtered.wav",
+                                                  "WAV Files (*.wav)")
+        if not out_path:
+            return
+
+        try:
+            filter_type, percentage, edges = self.filter_params()
+            engine = filter_file(in_path, out_path, filter_type, percentage,
+                                 engine=self.filter_engine.currentText(),
+                                 zero_phase=self.zero_phase.isChecked(), **edges)
+            QMessageBox.information(self, "Filter File",
+                                    f"Filtered audio saved to:\n{out_path}\n(engine: {engine.upper()})")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not filter file: {str(e)}")
 
     def plot_filtered_waveform(self, filter_type, filtered_signal):
         """Plot original and filtered waveforms with proper span selectors in same window"""
@@ -2182,66 +2315,80 @@ class ControlMenu(QDialog):
             if self.current_figure:
                 plt.close(self.current_figure)
 
+    def bank_fundamental(self):
+        """Fundamental for the harmonic bank: 'Center freq' or the median pitch"""
+        if not self.estimate_f0.isChecked():
+            return float(self.center_freq.text())
+
+        _, pitch = self.calculate_pitch()
+        voiced = pitch[np.isfinite(pitch)]
+        if len(voiced) == 0:
+            raise ValueError("No voiced frames found to estimate f0")
+        return float(np.median(voiced))
+
+    def plot_bank_response(self):
+        try:
+            f0 = self.bank_fundamental()
+        except ValueError as e:
+            QMessageBox.warning(self, "Harmonic Bank", str(e))
+            return
+        freqs = np.linspace(0, self.fs / 2, 8000)
+        masks = harmonic_masks(freqs, f0, self.n_harmonics.value())
+
+        self.current_figure, ax = plt.subplots(figsize=(12, 5))
+        self.current_figure.suptitle(f'Harmonic Bank Bands (f0 = {f0:.1f} Hz)')
+        for k, mask in enumerate(masks, start=1):
+            ax.fill_between(freqs, mask, alpha=0.5, label=f'H{k}')
+        ax.set_xlim(0, min(self.fs / 2, f0 * (len(masks) + 1)))
+        ax.set_xlabel('Frequency [Hz]')
+        ax.set_ylabel('Gain')
+        ax.legend(loc='upper right', ncol=min(len(masks), 6))
+        ax.grid(True)
+
+        plt.tight_layout()
+        plt.show()
+
+    def plot_harmonic_bank(self):
+        """Plot every harmonic band in its own row, each with its own span selector"""
+        fontsize = getattr(self, 'current_font_size', 12)
+        plt.style.use('default')
+        plt.rcParams.update({'font.size': fontsize})
+
+        f0 = self.bank_fundamental()
+        bands, centers = harmonic_bank(self.audio, self.fs, f0, self.n_harmonics.value())
+        self.harmonic_bands = bands
+
+        self.current_figure, ax = plt.subplots(len(bands) + 1, 1, sharex=True,
+                                               figsize=(12, 2 + 1.5 * len(bands)))
+        self.current_figure.suptitle(f'Harmonic Bank (f0 = {f0:.1f} Hz)')
+
+        ax[0].plot(self.time, self.audio)
+        ax[0].set(xlim=[0, self.duration], title='Original Signal')
+        for row, (band, center) in enumerate(zip(bands, centers), start=1):
+            ax[row].plot(self.time, band, linewidth=0.8)
+            ax[row].set_title(f'H{row} ({center:.1f} Hz)', fontsize=fontsize - 2)
+        ax[-1].set_xlabel('Time (s)')
+
+        def format_time_amp(x, y):
+            return f"time = {x:.2f} s, amplitude = {y:.3f}"
+        for axis in ax:
+            axis.format_coord = format_time_amp
+
+        shared_dialog = self.show_plot_window(self.current_figure, create_selector=False)
+        self.create_span_selector(ax[0], self.audio, shared_dialog, tag='original')
+        for row, band in enumerate(bands, start=1):
+            self.create_span_selector(ax[row], band, shared_dialog, tag=f'H{row}')
+
     def plot_filtering(self):
-        filter_type = self.filter_type.currentText()
-        percentage = float(self.percentage.text())
-        
-        if filter_type == 'Lowpass' or filter_type == 'Highpass':
-            fcut = float(self.fcut.text())
-            delta = fcut * (percentage / 100)
-            
-            if filter_type == 'Lowpass':
-                wp = fcut - delta
-                ws = fcut + delta
-            else:
-                wp = fcut + delta
-                ws = fcut - delta
-                
-            N, Wn = signal.ellipord(wp, ws, 3, 40, fs=self.fs)
-            b, a = signal.ellip(N, 0.1, 40, Wn, btype=filter_type.lower(), fs=self.fs)
-            
-        elif filter_type == 'Harmonic':
-            fund_freq = float(self.fund_freq.text())
-            center_freq = float(self.center_freq.text())
-            fc = fund_freq * center_freq
-            fcut1 = fc - center_freq/2
-            fcut2 = fc + center_freq/2
-            delta1 = fcut1 * (percentage / 100)
-            delta2 = fcut2 * (percentage / 100)
-            
-            wp1 = fcut1 + delta1
-            wp2 = fcut2 - delta2
-            ws1 = fcut1 - delta1
-            ws2 = fcut2 + delta2
-            
-            N, Wn = signal.ellipord([wp1, wp2], [ws1, ws2], 3, 40, fs=self.fs)
-            b, a = signal.ellip(N, 0.1, 40, Wn, btype='bandpass', fs=self.fs)
-            
-        else:  # Bandpass or Bandstop
-            fcut1 = float(self.fcut1.text())
-            fcut2 = float(self.fcut2.text())
-            delta1 = fcut1 * (percentage / 100)
-            delta2 = fcut2 * (percentage / 100)
-            
-            if filter_type == 'Bandpass':
-                wp1 = fcut1 + delta1
-                wp2 = fcut2 - delta2
-                ws1 = fcut1 - delta1
-                ws2 = fcut2 + delta2
-            else:
-                wp1 = fcut1 - delta1
-                wp2 = fcut2 + delta2
-                ws1 = fcut1 + delta1
-                ws2 = fcut2 - delta2
-                
-            N, Wn = signal.ellipord([wp1, wp2], [ws1, ws2], 3, 40, fs=self.fs)
-            b, a = signal.ellip(N, 0.1, 40, Wn, btype=filter_type.lower(), fs=self.fs)
-        
-        filtered_signal = signal.lfilter(b, a, self.audio)
-        
-        self.current_figure, ax = plt.subplots(2, figsize=(12,6))
-        self.current_figure.suptitle(f'Filtered Signal ({filter_type})')
-        
+        if self.filter_type.currentText() == 'Harmonic bank':
+            self.plot_harmonic_bank()
+            return
+
+        filter_type, percentage, edges = self.filter_params()
+        filtered_signal, _ = filter_signal(self.audio, self.fs, filter_type, percentage,
+                                           engine=self.filter_engine.currentText(),
+                                           zero_phase=self.zero_phase.isChecked(), **edges)
+
         if self.waveform_radio.isChecked():
             self.plot_filtered_waveform(filter_type, filtered_signal)
         else:
@@ -2786,6 +2933,13 @@ class ControlMenu(QDialog):
         # Clear the list
         self.plot_windows.clear()
 
+        for window in self.live_windows[:]:
+            try:
+                window.close()
+            except RuntimeError:
+                pass
+        self.live_windows.clear()
+
         # Stop all playback and timers if window is closed
         if hasattr(self.parent(), 'stop_audio_playback'):
             self.parent().stop_audio_playback()
@@ -0,0 +1,82 @@
+import numpy as np
+from scipy.fft import next_fast_len
+from scipy.signal import hilbert
+
+ENVELOPES = ('Moving average', 'RMS', 'Hilbert')
+SMOOTH_SECONDS = 0.02   # Default smoothing window
+DISPLAY_COLUMNS = 2000  # Min/max pairs kept when decimating for display
+
+
+def moving_average(x, n):
+    """Centred moving average of length n in O(N) with a cumulative sum.
+
+    Matches np.convolve(x, np.ones(n) / n, mode='same'), zero padding
+    included, without the O(N * n) cost.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = max(1, min(int(n), len(x)))
+    csum = np.concatenate(([0.0], np.cumsum(x)))
+    i = np.arange(len(x))
+    lo = np.clip(i - n // 2, 0, len(x))
+    hi = np.clip(i + (n - 1) // 2 + 1, 0, len(x))
+    return (csum[hi] - csum[lo]) / n
+
+
+def rms_envelope(x, n):
+    """Moving RMS over n samples"""
+    x = np.asarray(x, dtype=np.float64)
+    return np.sqrt(np.maximum(moving_average(x * x, n), 0.0))
+
+
+def hilbert_envelope(x, n=1):
+    """Magnitude of the analytic signal, optionally smoothed over n samples"""
+    x = np.asarray(x, dtype=np.float64)
+    if len(x) == 0:
+        return x
+    # Padding to a fast length keeps the FFT O(N log N) for awkward sizes
+    env = np.abs(hilbert(x, next_fast_len(len(x))))[:len(x)]
+    return moving_average(env, n) if n > 1 else env
+
+
+def amplitude_envelope(x, fs, method='Moving average', window_seconds=SMOOTH_SECONDS):
+    """Envelope of x by one of ENVELOPES with a window_seconds smoothing window"""
+    n = max(1, int(window_seconds * fs))
+    if method == 'RMS':
+        return rms_envelope(x, n)
+    if method == 'Hilbert':
+        return hilbert_envelope(x, n)
+    if method == 'Moving average':
+        return moving_average(np.abs(x), n)
+    raise ValueError(f"Unknown envelope method: {method}")
+
+
+def minmax_decimate(x, columns):
+    """Reduce x to `columns` (min, max) pairs interleaved as one zigzag line.
+
+    Drawing the zigzag looks the same as the full waveform at screen
+    resolution but costs 2 * columns points instead of len(x).
+    """
+    x = np.asarray(x)
+    columns = max(1, min(columns, len(x)))
+    usable = (len(x) // columns) * columns
+    if usable == 0:
+        return np.zeros(0)
+    blocks = x[len(x) - usable:].reshape(columns, -1)
+    out = np.empty(2 * columns, dtype=x.dtype)
+    out[0::2] = blocks.min(axis=1)
+    out[1::2] = blocks.max(axis=1)
+    return out
+
+
+def decimate_for_display(times, values, columns=DISPLAY_COLUMNS):
+    """Min/max decimate a curve to about 2 * columns points for plotting.
+
+    Short curves are returned unchanged; longer ones keep every peak and
+    dip visible at screen resolution.
+    """
+    if len(values) <= 2 * columns:
+        return times, values
+    reduced = minmax_decimate(values, columns)
+    # minmax_decimate drops the first len % columns samples
+    start = len(values) % columns
+    return np.linspace(times[start], times[-1], len(reduced)), reduced
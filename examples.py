@@ -3,6 +3,7 @@ import librosa
 import librosa.display
 import os
 import time
+from collections import OrderedDict
 import matplotlib.pyplot as plt
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 from PyQt5.QtCore import QUrl, Qt
@@ -12,13 +13,29 @@ from PyQt5.QtWidgets import ( QTextBrowser, QComboBox, QCheckBox, QWidget, QVBox
                             QSizePolicy, QApplication)
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas, NavigationToolbar2QT
 from matplotlib.figure import Figure
-from scipy.signal import find_peaks
-from scipy.signal.windows import blackmanharris 
 
-# Add this import at the top
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QUrl
+from help import create_html_view, set_view_html
 from config import BASE_DIR, RECORDINGS_DIR, LIBRARY_DIR
+from envelope import amplitude_envelope, decimate_for_display
+from beatAnalysis import FrameSpectrumCache, estimate_beats
+
+CACHE_SIZE = 8  # Recordings (and analysis parameter sets) kept in memory
+NOTIFY_INTERVAL_MS = 20   # Playback position updates (~50 fps)
+# Position updates closer than this to the last draw are dropped. It is
+# well under the notify period, so timer jitter alone never drops one.
+MIN_DRAW_INTERVAL_S = 0.5 * NOTIFY_INTERVAL_MS / 1000
+
+
+def cached(cache, key, compute, size=CACHE_SIZE):
+    """Return cache[key], computing it on a miss; least recently used entries are evicted"""
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    value = compute()
+    cache[key] = value
+    if len(cache) > size:
+        cache.popitem(last=False)
+    return value
 
 class BeatFrequencyVisualizer(QWidget):
     def __init__(self, parent=None, controller=None):
@@ -29,21 +46,28 @@ class BeatFrequencyVisualizer(QWidget):
         self.time = None
         self.playback_lines = []
         self.axes = []  # Store references to all axes
-        self.backgrounds = None  # Will store the complete figure background
-        self.last_update_time = time.time()
-        self.update_interval = 0.02  # 20ms for ~50fps
+        self.backgrounds = None  # Blitting background of each axes
+        self.last_update_time = time.perf_counter()
 
-        self.first_playback = True  # Add this flag
+        # Decoded audio keyed by (path, mtime); envelope and spectrogram by
+        # (path, mtime, window, hop), so switching files or back to earlier
+        # parameters needs no decoding or STFT
+        self.file_key = None
+        self.audio_cache = OrderedDict()
+        self.analysis_cache = OrderedDict()
+        self.beat_cache = OrderedDict()
 
         # Add FFT parameters initialization
         self.fft_size = 4096 * 4  # 32768-point FFT for high resolution
         self.peak_markers = None  # Will be initialized in plot_spectrog
+        self.frames = None        # FrameSpectrumCache of the current file
+        self.fft_frame = None     # Grid frame shown in the real-time FFT
         
         self.recordings_dir = str(RECORDINGS_DIR)  # Convert Path object to string if needed
         
         # Media player setup
         self.media_player = QMediaPlayer()
-        self.media_player.setNotifyInterval(20)
+        self.media_player.setNotifyInterval(NOTIFY_INTERVAL_MS)
         self.media_player.positionChanged.connect(self.update_playback_cursor)
         
         self.init_ui()
@@ -68,6 +92,9 @@ class BeatFrequencyVisualizer(QWidget):
         
         self.replot_btn = QPushButton("Replot")
         self.replot_btn.clicked.connect(self.plot_spectrogram)
+
+        self.beats_btn = QPushButton("Estimate Beats")
+        self.beats_btn.clicked.connect(self.show_beats)
         
         # File selection dropdown
         self.file_combo = QComboBox()
@@ -98,6 +125,7 @@ class BeatFrequencyVisualizer(QWidget):
         param_layout.addWidget(QLabel("Hop Size:"))
         param_layout.addWidget(self.hop_size_spin)
         param_layout.addWidget(self.replot_btn)
+        param_layout.addWidget(self.beats_btn)
 
         # Add Help button
         self.help_btn = QPushButton("Help")
@@ -120,6 +148,7 @@ class BeatFrequencyVisualizer(QWidget):
         # Visualization area
         self.figure = Figure(figsize=(12, 10))
         self.canvas = FigureCanvas(self.figure)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
         self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.toolbar = NavigationToolbar2QT(self.canvas, self)
         
@@ -143,10 +172,8 @@ class BeatFrequencyVisualizer(QWidget):
         self.help_window.resize(800, 600)
         
         layout = QVBoxLayout()
-        web_view = QWebEngineView()
-        
-        # Use a data URL to display our HTML content
-        web_view.setHtml(html_content, QUrl.fromLocalFile(''))
+        web_view = create_html_view()
+        set_view_html(web_view, html_content)
         
         layout.addWidget(web_view)
         close_btn = QPushButton("Close")
@@ -162,31 +189,29 @@ class BeatFrequencyVisualizer(QWidget):
             
         self.figure.clear()
         self.playback_lines = []
+        self.backgrounds = None
         
         # Create 4 subplots and store their references
         gs = self.figure.add_gridspec(4, 1, height_ratios=[1, 1, 2, 2], hspace=0.6)
         
         # 1. Waveform plot
         self.ax_wave = self.figure.add_subplot(gs[0])
-        self.ax_wave.plot(self.time, self.audio_data, color='b', linewidth=0.5, alpha=0.7)
+        self.ax_wave.plot(*decimate_for_display(self.time, self.audio_data),
+                          color='b', linewidth=0.5, alpha=0.7)
         self.playback_lines.append(self.ax_wave.axvline(x=0, color='r', linewidth=1, animated=True))
         
+        analysis = cached(self.analysis_cache,
+                          self.file_key + (self.window_size_spin.value(), self.hop_size_spin.value()),
+                          self.compute_analysis)
+
         # 2. Amplitude envelope plot
         self.ax_env = self.figure.add_subplot(gs[1], sharex=self.ax_wave)
-        amplitude = np.abs(self.audio_data)
-        smooth_window = int(0.02 * self.sample_rate)
-        amplitude_smooth = np.convolve(amplitude, np.ones(smooth_window)/smooth_window, mode='same')
-        self.ax_env.plot(self.time, amplitude_smooth, 'b-', linewidth=1)
+        self.ax_env.plot(*decimate_for_display(self.time, analysis['envelope']), 'b-', linewidth=1)
         self.playback_lines.append(self.ax_env.axvline(x=0, color='r', linewidth=1, animated=True))
         
         # 3. Spectrogram plot
         self.ax_spec = self.figure.add_subplot(gs[2], sharex=self.ax_wave)
-        D = librosa.stft(self.audio_data,
-                        n_fft=self.window_size_spin.value(),
-                        hop_length=self.hop_size_spin.value(),
-                        win_length=self.window_size_spin.value())
-        S_db = librosa.amplitude_to_db(np.abs(D), ref=np.max)
-        librosa.display.specshow(S_db,
+        librosa.display.specshow(analysis['S_db'],
                                sr=self.sample_rate,
                                hop_length=self.hop_size_spin.value(),
                                x_axis='time',
@@ -199,10 +224,13 @@ class BeatFrequencyVisualizer(QWidget):
         
         # 4. Real-time FFT plot
         self.ax_fft = self.figure.add_subplot(gs[3])
-        freqs = np.fft.rfftfreq(self.fft_size, 1/self.sample_rate)  # Use self.fft_size
+        self.frames = analysis['frames']
+        self.fft_frame = None
+        freqs = self.frames.freqs
 
-        self.fft_line, = self.ax_fft.semilogx(freqs, np.zeros_like(freqs), 'b-', linewidth=0.8)
-        self.peak_markers, = self.ax_fft.plot([], [], 'ro', markersize=4, alpha=0.7)
+        self.fft_line, = self.ax_fft.semilogx(freqs, np.full_like(freqs, -60), 'b-', linewidth=0.8,
+                                              animated=True)
+        self.peak_markers, = self.ax_fft.plot([], [], 'ro', markersize=4, alpha=0.7, animated=True)
 
         # Enhanced FFT plot styling
         self.ax_fft.set_title("High-Resolution Frequency Spectrum", pad=8)
@@ -225,73 +253,111 @@ class BeatFrequencyVisualizer(QWidget):
         self.ax_fft.set_xlim(20, 10000)
         self.ax_fft.set_ylim(-60, 0)
         self.figure.tight_layout(rect=[0, 0, 1, 0.95])
+        self.axes = [self.ax_wave, self.ax_env, self.ax_spec, self.ax_fft]
         
-        # Draw everything
-        self.canvas.draw()
-        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
-        
+        # Draw everything; on_draw captures the background for blitting
         for line in self.playback_lines:
             line.set_animated(True)
+        self.canvas.draw()
+
+    def animated_artists(self, ax):
+        artists = self.playback_lines + [self.fft_line, self.peak_markers]
+        return [artist for artist in artists if artist.axes is ax]
+
+    def on_draw(self, event):
+        """Re-capture the blitting backgrounds after every full draw (first show, resize, zoom)"""
+        if not self.axes:
+            return
+        self.backgrounds = {ax: self.canvas.copy_from_bbox(ax.bbox) for ax in self.axes}
+        for ax in self.axes:
+            for artist in self.animated_artists(ax):
+                ax.draw_artist(artist)
+
+    def compute_analysis(self):
+        """Envelope and spectrogram of the current file for the current window/hop"""
+        envelope = amplitude_envelope(self.audio_data, self.sample_rate, 'Moving average', 0.02)
+        D = librosa.stft(self.audio_data,
+                        n_fft=self.window_size_spin.value(),
+                        hop_length=self.hop_size_spin.value(),
+                        win_length=self.window_size_spin.value())
+        S_db = librosa.amplitude_to_db(np.abs(D), ref=np.max)
+        # Real-time FFT frames on the spectrogram's hop grid, computed as playback reaches them
+        frames = FrameSpectrumCache(self.audio_data, self.sample_rate, self.window_size_spin.value(),
+                                    self.fft_size, self.hop_size_spin.value())
+        return {'envelope': envelope, 'S_db': S_db, 'frames': frames}
+
+    def show_beats(self):
+        """Report the beat rates of the current file and the partial pairs that cause them"""
+        if self.audio_data is None:
+            return
+        try:
+            result = cached(self.beat_cache, self.file_key,
+                            lambda: estimate_beats(self.audio_data, self.sample_rate))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Beat estimation failed: {str(e)}")
+            return
+
+        if not result['beats']:
+            QMessageBox.information(self, "Beats", "No beats found in this recording.")
+            return
+
+        lines = []
+        for rate, strength in result['beats']:
+            lines.append(f"<b>{rate:.2f} Hz</b> (period {1 / rate:.2f} s, strength {strength:.2f})")
+            pairs = [p for p in result['pairs'] if p[3] == rate]
+            for f_low, f_high, diff, _ in pairs:
+                lines.append(f"&nbsp;&nbsp;&nbsp;{f_low:.1f} Hz and {f_high:.1f} Hz (difference {diff:.2f} Hz)")
+        duration = len(self.audio_data) / self.sample_rate
+        lines.append(f"<br><i>{duration:.1f} s of audio analysed in {result['elapsed'] * 1000:.0f} ms</i>")
+        QMessageBox.information(self, "Beats", "<br>".join(lines))
+
+    def load_audio(self, file_path):
+        """Decode a file at its native sample rate (no resampling), cached per (path, mtime)"""
+        self.file_key = (file_path, os.path.getmtime(file_path))
+        self.audio_data, self.sample_rate = cached(
+            self.audio_cache, self.file_key,
+            lambda: librosa.load(file_path, sr=None, mono=True))
+        self.time = np.arange(len(self.audio_data)) / self.sample_rate
 
     def update_playback_cursor(self, position):
         current_time = position / 1000  # Convert ms to seconds
-        
-        # Update real-time FFT only when playing
-        if self.media_player.state() == QMediaPlayer.PlayingState:
-            start_sample = int(current_time * self.sample_rate)
-            end_sample = start_sample + self.window_size_spin.value()
-            
-            if end_sample < len(self.audio_data):
-                frame = self.audio_data[start_sample:end_sample]
-                
-                # Apply window
-                window = blackmanharris(len(frame))
-                frame_windowed = frame * window
-                
-                # Compute FFT
-                fft_result = np.fft.rfft(frame_windowed, n=self.fft_size)
-                fft_magnitude = np.abs(fft_result)
-                fft_magnitude_db = 20 * np.log10(fft_magnitude + 1e-8)
-                fft_magnitude_db -= np.max(fft_magnitude_db)  # Normalize so 0 dB is peak
-                fft_magnitude_db = np.clip(fft_magnitude_db, -60, 0)
-
-
-                # Update plot
-                freqs = np.fft.rfftfreq(self.fft_size, 1/self.sample_rate)
-                self.fft_line.set_data(freqs, fft_magnitude_db) 
-
-                # Find and mark peaks
-                peaks, _ = find_peaks(fft_magnitude_db, height=-40, prominence=6, width=2)
-                if len(peaks) > 0:
-                    self.peak_markers.set_data(freqs[peaks], fft_magnitude_db[peaks])
-                else:
-                    self.peak_markers.set_data([], [])
-
-                        
+        playing = self.media_player.state() == QMediaPlayer.PlayingState
+        if self.backgrounds is None:
+            return
+
+        # Drop position updates that arrive while drawing is behind
+        now = time.perf_counter()
+        if playing and now - self.last_update_time < MIN_DRAW_INTERVAL_S:
+            return
+        self.last_update_time = now
+
+        changed = [self.ax_wave, self.ax_env, self.ax_spec]
+
+        # Update real-time FFT only when playing, and only when the grid frame changes
+        if playing:
+            index = self.frames.frame_index(current_time)
+            if index is not None and index != self.fft_frame:
+                self.fft_frame = index
+                fft_magnitude_db, peaks = self.frames.spectrum(index)
+                self.fft_line.set_ydata(fft_magnitude_db)
+                self.peak_markers.set_data(self.frames.freqs[peaks], fft_magnitude_db[peaks])
+                changed.append(self.ax_fft)
+
         # Update playback cursors for other plots
         for line in self.playback_lines:
             line.set_xdata([current_time, current_time])
         
-        # Handle the blitting for smooth updates
-        if hasattr(self, 'background'):
-            try:
-                # Restore background
-                self.canvas.restore_region(self.background)
-                
-                # Redraw FFT plot if playing
-                if self.media_player.state() == QMediaPlayer.PlayingState:
-                    self.ax_fft.draw_artist(self.fft_line)
-                
-                # Redraw cursor lines
-                for line in self.playback_lines:
-                    line.axes.draw_artist(line)
-                
-                # Blit the updated regions
-                self.canvas.blit(self.figure.bbox)
-            except Exception as e:
-                print(f"Blitting error: {e}")
-                # Fallback to full redraw if blitting fails
-                self.canvas.draw()
+        # Blit only the axes that changed, each over its own background
+        try:
+            for ax in changed:
+                self.canvas.restore_region(self.backgrounds[ax])
+                for artist in self.animated_artists(ax):
+                    ax.draw_artist(artist)
+                self.canvas.blit(ax.bbox)
+        except Exception as e:
+            print(f"Blitting error: {e}")
+            # Fallback to full redraw if blitting fails
+            self.canvas.draw()
 
     def load_audio_files_list(self):
         """Load all WAV files from the recordings directory into the dropdown"""
@@ -329,18 +395,12 @@ class BeatFrequencyVisualizer(QWidget):
             self.media_player.stop()
             self.play_btn.setText("Play")  # <-- Add this line
             
-            self.audio_data, self.sample_rate = librosa.load(
-                file_path, 
-                sr=44100,
-                mono=True
-            )
-            self.time = np.arange(len(self.audio_data)) / self.sample_rate
+            self.load_audio(file_path)
             
             url = QUrl.fromLocalFile(file_path)
             self.media_player.setMedia(QMediaContent(url))
             
             self.plot_spectrogram()
-            self.first_playback = True  # Reset flag for new file
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load audio: {str(e)}")
@@ -359,11 +419,6 @@ class BeatFrequencyVisualizer(QWidget):
             if self.media_player.position() >= self.media_player.duration() - 100:
                 self.media_player.setPosition(0)
 
-            # Check if it's the first playback
-            if self.first_playback:
-                self.plot_spectrogram()
-                self.first_playback = False
-
             self.media_player.play()
             self.play_btn.setText("Pause")
 
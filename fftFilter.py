@@ -0,0 +1,235 @@
+from functools import lru_cache
+
+import numpy as np
+import soundfile as sf
+from scipy import signal
+from scipy.fft import rfft, irfft, next_fast_len
+
+from filterDesign import GSTOP, BLOCK_SIZE, filter_edges, design_sos, apply_sos
+
+ENGINES = ('Auto', 'IIR (SOS)', 'FIR (FFT)')
+
+
+@lru_cache(maxsize=32)
+def _design_fir_cached(filter_type, fs, percentage, fcut, fcut1, fcut2, fund_freq, center_freq):
+    wp, ws, btype = filter_edges(filter_type, percentage, fcut, fcut1, fcut2,
+                                 fund_freq, center_freq)
+    wp = np.atleast_1d(wp)
+    ws = np.atleast_1d(ws)
+    width = np.min(np.abs(wp - ws))
+    numtaps, beta = signal.kaiserord(GSTOP, width / (fs / 2))
+    numtaps |= 1  # Odd length: type I filter, valid for every band type
+
+    cutoff = (wp + ws) / 2
+    pass_zero = btype in ('lowpass', 'bandstop')
+    taps = signal.firwin(numtaps, cutoff if len(cutoff) > 1 else cutoff[0],
+                         window=('kaiser', beta), pass_zero=pass_zero, fs=fs)
+    return taps
+
+
+def design_fir(filter_type, fs, percentage, fcut=None, fcut1=None, fcut2=None,
+               fund_freq=None, center_freq=None):
+    """Linear-phase FIR equivalent of design_sos (Kaiser window method).
+
+    Cutoffs sit in the middle of each transition band and the length is
+    chosen by kaiserord for the same stopband attenuation as the IIR design.
+    Like design_sos, the design is cached and each caller gets a writable copy.
+    """
+    return _design_fir_cached(filter_type, fs, percentage, fcut, fcut1, fcut2,
+                              fund_freq, center_freq).copy()
+
+
+def iir_cost(sos, zero_phase=False):
+    """Approximate flops per output sample of sosfilt (5 mults + 4 adds per section)"""
+    return 9 * len(sos) * (2 if zero_phase else 1)
+
+
+def fft_cost(numtaps, nfft):
+    """Approximate flops per output sample of overlap-add with a given FFT size"""
+    step = nfft - numtaps + 1
+    if step <= 0:
+        return np.inf
+    transforms = 2 * 2.5 * nfft * np.log2(nfft)  # Forward + inverse real FFT
+    products = 6 * (nfft // 2 + 1)               # Complex multiply per bin
+    return (transforms + products) / step
+
+
+def optimal_nfft(numtaps):
+    """FFT size with the lowest cost per output sample for a filter length"""
+    smallest = next_fast_len(2 * numtaps)
+    candidates = [next_fast_len(smallest * 2 ** k) for k in range(6)]
+    return min(candidates, key=lambda nfft: fft_cost(numtaps, nfft))
+
+
+def choose_engine(sos, taps, zero_phase=False):
+    """Pick 'iir' or 'fft' according to the expected cost per sample"""
+    # The FIR is linear phase, so zero phase only costs a delay compensation
+    fir = fft_cost(len(taps), optimal_nfft(len(taps)))
+    return 'iir' if iir_cost(sos, zero_phase) <= fir else 'fft'
+
+
+class OverlapAddFilter:
+    """Streaming FIR filter using FFT overlap-add.
+
+    process() accepts blocks of any length (1-D or frames x channels) and
+    returns the output that is complete so far; flush() returns the rest,
+    including the convolution tail. Memory is bounded by the FFT size.
+    """
+
+    def __init__(self, taps, nfft=None):
+        self.taps = np.asarray(taps, dtype=float)
+        self.numtaps = len(self.taps)
+        self.nfft = nfft or optimal_nfft(self.numtaps)
+        self.step = self.nfft - self.numtaps + 1
+        if self.step < self.numtaps - 1:
+            raise ValueError("FFT size must be at least twice the filter length")
+        self.H = rfft(self.taps, self.nfft)
+        self._pending = None
+        self._tail = None
+
+    def _init_state(self, block):
+        trailing = block.shape[1:]
+        self._pending = np.zeros((0,) + trailing)
+        self._tail = np.zeros((self.numtaps - 1,) + trailing)
+
+    def _convolve_segments(self, x):
+        """Filter a whole number of `step`-long segments"""
+        n_seg = len(x) // self.step
+        segments = x.reshape((n_seg, self.step) + x.shape[1:])
+        H = self.H.reshape((1, -1) + (1,) * (x.ndim - 1))
+        y = irfft(rfft(segments, self.nfft, axis=1) * H, self.nfft, axis=1)
+
+        overlap = self.numtaps - 1
+        out = y[:, :self.step].copy()
+        tails = y[:, self.step:self.step + overlap]
+        out[0, :overlap] += self._tail
+        out[1:, :overlap] += tails[:-1]
+        self._tail = tails[-1].copy()
+        return out.reshape((n_seg * self.step,) + x.shape[1:])
+
+    def process(self, block):
+        block = np.asarray(block, dtype=float)
+        if self._pending is None:
+            self._init_state(block)
+
+        x = np.concatenate([self._pending, block]) if len(self._pending) else block
+        usable = (len(x) // self.step) * self.step
+        self._pending = x[usable:].copy()
+        if usable == 0:
+            return np.zeros((0,) + x.shape[1:])
+        return self._convolve_segments(x[:usable])
+
+    def flush(self):
+        """Return the remaining output (pending input plus the filter tail)"""
+        if self._pending is None:
+            return np.zeros(0)
+
+        remaining = len(self._pending)
+        padded = np.zeros((self.step,) + self._pending.shape[1:])
+        padded[:remaining] = self._pending
+        out = self._convolve_segments(padded)
+        out = np.concatenate([out, self._tail])[:remaining + self.numtaps - 1]
+        self._pending = None
+        self._tail = None
+        return out
+
+
+def fir_filter(taps, audio, zero_phase=False, block_size=BLOCK_SIZE):
+    """Filter a whole array with OverlapAddFilter, returning len(audio) samples.
+
+    With zero_phase the (M-1)/2 samples of group delay of the linear-phase
+    FIR are removed so the output lines up with the input.
+    """
+    audio = np.asarray(audio, dtype=float)
+    delay = (len(taps) - 1) // 2 if zero_phase else 0
+    out = np.empty_like(audio)
+    engine = OverlapAddFilter(taps)
+
+    written = 0
+    skip = delay
+
+    def emit(y):
+        nonlocal written, skip
+        if skip:
+            drop = min(skip, len(y))
+            y = y[drop:]
+            skip -= drop
+        count = min(len(y), len(out) - written)
+        out[written:written + count] = y[:count]
+        written += count
+
+    for start in range(0, len(audio), block_size):
+        emit(engine.process(audio[start:start + block_size]))
+    emit(engine.flush())
+    return out
+
+
+def filter_signal(audio, fs, filter_type, percentage, engine='Auto', zero_phase=False, **edges):
+    """Filter an in-memory signal with the IIR or FIR design.
+
+    Returns (filtered, engine_used) where engine_used is 'iir' or 'fft'.
+    """
+    sos = design_sos(filter_type, fs, percentage, **edges)
+    if engine == 'IIR (SOS)':
+        chosen = 'iir'
+    else:
+        taps = design_fir(filter_type, fs, percentage, **edges)
+        chosen = 'fft' if engine == 'FIR (FFT)' else choose_engine(sos, taps, zero_phase)
+
+    if chosen == 'iir':
+        return apply_sos(sos, audio, zero_phase=zero_phase), chosen
+    return fir_filter(taps, audio, zero_phase=zero_phase), chosen
+
+
+def filter_file(in_path, out_path, filter_type, percentage, engine='Auto', zero_phase=False,
+                block_size=BLOCK_SIZE, **edges):
+    """Filter an audio file into another one without loading it into memory.
+
+    Blocks are read, filtered and written one at a time. Zero-phase output
+    always uses the FIR engine, since a backwards IIR pass would need the
+    whole signal. Returns the engine that was used.
+    """
+    with sf.SoundFile(in_path) as src:
+        fs = src.samplerate
+        sos = design_sos(filter_type, fs, percentage, **edges)
+        taps = design_fir(filter_type, fs, percentage, **edges)
+
+        if zero_phase or engine == 'FIR (FFT)':
+            chosen = 'fft'
+        elif engine == 'IIR (SOS)':
+            chosen = 'iir'
+        else:
+            chosen = choose_engine(sos, taps)
+
+        subtype = 'FLOAT' if str(out_path).lower().endswith('.wav') else None
+        with sf.SoundFile(out_path, 'w', samplerate=fs, channels=src.channels,
+                          subtype=subtype) as dst:
+            blocks = src.blocks(blocksize=block_size, always_2d=True, dtype='float64')
+
+            if chosen == 'iir':
+                zi = np.zeros((len(sos), 2, src.channels))
+                for block in blocks:
+                    filtered, zi = signal.sosfilt(sos, block, axis=0, zi=zi)
+                    dst.write(filtered)
+                return chosen
+
+            fir = OverlapAddFilter(taps)
+            remaining = src.frames
+            skip = (len(taps) - 1) // 2 if zero_phase else 0
+
+            def emit(y):
+                nonlocal remaining, skip
+                if skip:
+                    drop = min(skip, len(y))
+                    y = y[drop:]
+                    skip -= drop
+                y = y[:remaining]
+                if len(y):
+                    dst.write(y)
+                    remaining -= len(y)
+
+            for block in blocks:
+                emit(fir.process(block))
+            emit(fir.flush())
+
+    return chosen
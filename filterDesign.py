@@ -0,0 +1,107 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy import signal
+
+# Elliptic design specs shared by every filter type (dB)
+GPASS = 3       # Max. passband loss used to estimate the order
+GSTOP = 40      # Min. stopband attenuation used to estimate the order
+RP = 0.1        # Passband ripple of the designed filter
+RS = 40         # Stopband attenuation of the designed filter
+
+# Samples processed per sosfilt call when filtering long recordings
+BLOCK_SIZE = 65536
+
+FILTER_TYPES = ('Harmonic', 'Lowpass', 'Highpass', 'Bandpass', 'Bandstop')
+
+
+def filter_edges(filter_type, percentage, fcut=None, fcut1=None, fcut2=None,
+                 fund_freq=None, center_freq=None):
+    """Return (wp, ws, btype) for one of the ControlMenu filter types.
+
+    The transition band is `percentage` % of each cutoff frequency. For the
+    'Harmonic' type the passband is centred on fund_freq * center_freq and is
+    center_freq wide.
+    """
+    if filter_type not in FILTER_TYPES:
+        raise ValueError(f"Unknown filter type: {filter_type}")
+
+    if filter_type in ('Lowpass', 'Highpass'):
+        delta = fcut * (percentage / 100)
+        if filter_type == 'Lowpass':
+            return fcut - delta, fcut + delta, 'lowpass'
+        return fcut + delta, fcut - delta, 'highpass'
+
+    if filter_type == 'Harmonic':
+        fc = fund_freq * center_freq
+        fcut1 = fc - center_freq / 2
+        fcut2 = fc + center_freq / 2
+        btype = 'bandpass'
+    else:
+        btype = filter_type.lower()
+
+    delta1 = fcut1 * (percentage / 100)
+    delta2 = fcut2 * (percentage / 100)
+
+    if btype == 'bandpass':
+        wp = (fcut1 + delta1, fcut2 - delta2)
+        ws = (fcut1 - delta1, fcut2 + delta2)
+    else:
+        wp = (fcut1 - delta1, fcut2 + delta2)
+        ws = (fcut1 + delta1, fcut2 - delta2)
+    return wp, ws, btype
+
+
+@lru_cache(maxsize=32)
+def _design_sos_cached(filter_type, fs, percentage, fcut, fcut1, fcut2, fund_freq, center_freq):
+    wp, ws, btype = filter_edges(filter_type, percentage, fcut, fcut1, fcut2,
+                                 fund_freq, center_freq)
+    N, Wn = signal.ellipord(wp, ws, GPASS, GSTOP, fs=fs)
+    return signal.ellip(N, RP, RS, Wn, btype=btype, fs=fs, output='sos')
+
+
+def design_sos(filter_type, fs, percentage, fcut=None, fcut1=None, fcut2=None,
+               fund_freq=None, center_freq=None):
+    """Design an elliptic filter in second-order sections.
+
+    Designs are cached on all of their arguments, so asking again for the
+    same filter (e.g. plotting the response and then filtering) is free.
+    Each caller gets its own writable copy: sosfilt rejects read-only
+    arrays, and the cached design must not be modified.
+    """
+    return _design_sos_cached(filter_type, fs, percentage, fcut, fcut1, fcut2,
+                              fund_freq, center_freq).copy()
+
+
+def _sosfilt_blocks(sos, x, out, block_size, zi):
+    """Run sosfilt over x in blocks, carrying the filter state across them"""
+    for start in range(0, len(x), block_size):
+        stop = min(start + block_size, len(x))
+        out[start:stop], zi = signal.sosfilt(sos, x[start:stop], zi=zi)
+    return out
+
+
+def apply_sos(sos, audio, zero_phase=False, block_size=BLOCK_SIZE):
+    """Filter audio with a SOS filter, block by block.
+
+    With zero_phase the output is filtered a second time backwards (like
+    sosfiltfilt), which cancels the phase response and squares the
+    magnitude response. Both passes work in place on the output array, so
+    memory stays at one copy of the signal regardless of its length.
+    """
+    audio = np.asarray(audio, dtype=float)
+    out = np.empty_like(audio)
+    if len(audio) == 0:
+        return out
+
+    if not zero_phase:
+        zi = np.zeros((sos.shape[0], 2))
+        return _sosfilt_blocks(sos, audio, out, block_size, zi)
+
+    # Start each pass in the steady state of its first sample to avoid a
+    # start-up transient at both ends
+    zi_step = signal.sosfilt_zi(sos)
+    _sosfilt_blocks(sos, audio, out, block_size, zi_step * audio[0])
+    backwards = out[::-1]
+    _sosfilt_blocks(sos, backwards, backwards, block_size, zi_step * backwards[0])
+    return out
@@ -0,0 +1,23 @@
+import numpy as np
+
+ENERGY_FLOOR = 1e-12   # Added before the log so silent frames stay finite
+
+
+def short_time_energy_db(frames):
+    """Mean energy in dB of windowed frames (along the last axis)"""
+    frames = np.asarray(frames, dtype=np.float64)
+    return 10 * np.log10(np.mean(frames ** 2, axis=-1) + ENERGY_FLOOR)
+
+
+def spectral_centroid(frames, fs, nfft=None):
+    """Power-weighted spectral centroid in Hz of windowed frames (along the last axis).
+
+    Frames are zero-padded to nfft points if it is longer than the frame;
+    silent frames give NaN.
+    """
+    frames = np.asarray(frames)
+    n = frames.shape[-1] if nfft is None else max(int(nfft), frames.shape[-1])
+    power = np.abs(np.fft.rfft(frames, n, axis=-1)) ** 2
+    total = power.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total > 0, power @ np.fft.rfftfreq(n, 1 / fs) / total, np.nan)
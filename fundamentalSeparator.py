@@ -6,8 +6,10 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                             QPushButton, QLabel, QMessageBox, 
-                            QDoubleSpinBox, QFormLayout)
+                            QDoubleSpinBox, QFormLayout, QCheckBox)
 from PyQt5.QtCore import Qt
+from pitchEstimation import estimate_f0
+from harmonicBank import separate_tracked
 
 class FundamentalHarmonicsSeparator(QWidget):
     def __init__(self, parent=None):
@@ -15,6 +17,8 @@ class FundamentalHarmonicsSeparator(QWidget):
         self.original_signal = None
         self.fs = 44100
         self.f0 = None
+        self.f0_track = None      # Per-frame f0 (NaN where unvoiced)
+        self.track_times = None   # Frame centres of f0_track (s)
         self.current_stream = None
         self.setup_ui()
 
@@ -43,6 +47,12 @@ class FundamentalHarmonicsSeparator(QWidget):
         
         freq_layout.addRow("Fundamental (Hz):", self.f0_spinbox)
         freq_layout.addRow("Bandwidth (Hz):", self.bandwidth_spinbox)
+
+        # Follow the per-frame f0 track instead of the fixed fundamental
+        self.track_pitch = QCheckBox("Track pitch")
+        self.track_pitch.setToolTip("Separate with STFT masks that follow the estimated pitch (vibrato, melodies)")
+        self.track_pitch.toggled.connect(self.update_fundamental)
+        freq_layout.addRow(self.track_pitch)
         
         # Buttons
         self.btn_estimate = QPushButton("Estimate F0")
@@ -81,25 +91,28 @@ class FundamentalHarmonicsSeparator(QWidget):
         """Load a signal for processing"""
         self.original_signal = signal
         self.fs = fs
+        self.f0_track = None
+        self.track_times = None
         self.plot_signals()
 
     def estimate_fundamental(self):
-        """Estimate fundamental frequency using autocorrelation"""
+        """Estimate a per-frame f0 track and a global f0 (FFT autocorrelation)"""
         if self.original_signal is None:
             QMessageBox.warning(self, "Warning", "No signal loaded!")
             return
-            
-        signal = self.original_signal - np.mean(self.original_signal)
-        autocorr = np.correlate(signal, signal, mode='full')
-        autocorr = autocorr[len(autocorr)//2:]
-        
-        # Find first peak after zero-lag
-        peaks = np.where((autocorr[1:-1] > autocorr[:-2]) & 
-                        (autocorr[1:-1] > autocorr[2:]))[0] + 1
-        
-        if len(peaks) > 0:
-            self.f0 = self.fs / peaks[0]
+
+        times, track, f0 = estimate_f0(self.original_signal, self.fs,
+                                       fmin=self.f0_spinbox.minimum(),
+                                       fmax=self.f0_spinbox.maximum())
+        
+        if np.isfinite(f0):
+            self.track_times = times
+            self.f0_track = track
+            self.f0 = f0
+            # Avoid a second separation through valueChanged
+            self.f0_spinbox.blockSignals(True)
             self.f0_spinbox.setValue(self.f0)
+            self.f0_spinbox.blockSignals(False)
             self.separate_components()
             self.plot_signals()
         else:
@@ -118,6 +131,10 @@ class FundamentalHarmonicsSeparator(QWidget):
             return
             
         bandwidth = self.bandwidth_spinbox.value()
+
+        if self.track_pitch.isChecked():
+            self.separate_tracked(bandwidth)
+            return
         
         # Bandpass filter for fundamental
         nyq = 0.5 * self.fs
@@ -130,6 +147,22 @@ class FundamentalHarmonicsSeparator(QWidget):
         b, a = butter(4, [low, high], btype='bandstop')
         self.harmonics = lfilter(b, a, self.original_signal)
 
+    def separate_tracked(self, bandwidth):
+        """Time-varying separation with per-frame masks around the f0 track"""
+        if self.f0_track is None:
+            self.track_times, self.f0_track, _ = estimate_f0(
+                self.original_signal, self.fs,
+                fmin=self.f0_spinbox.minimum(), fmax=self.f0_spinbox.maximum())
+
+        if not np.isfinite(self.f0_track).any():
+            # Nothing voiced to follow: fall back to the fixed fundamental
+            self.track_pitch.setChecked(False)
+            QMessageBox.warning(self, "Warning", "No pitch found to track, using the fixed fundamental.")
+            return
+
+        self.fundamental, self.harmonics = separate_tracked(
+            self.original_signal, self.fs, self.track_times, self.f0_track, bandwidth)
+
     def plot_signals(self):
         """Plot original, fundamental, and harmonics"""
         self.figure.clear()
@@ -145,12 +178,24 @@ class FundamentalHarmonicsSeparator(QWidget):
         ax1.set_title("Original Signal")
         ax1.set_ylabel("Amplitude")
         ax1.grid(True, alpha=0.3)
+
+        # Estimated pitch track on a secondary axis
+        if self.f0_track is not None:
+            ax1_f0 = ax1.twinx()
+            ax1_f0.plot(self.track_times, self.f0_track, 'm', linewidth=1.2)
+            ax1_f0.set_ylabel("f0 (Hz)", color='m')
+            # An all-unvoiced track has no median (nanmedian would warn and give nan)
+            if np.isfinite(self.f0_track).any():
+                ax1.set_title(f"Original Signal (median f0 {np.nanmedian(self.f0_track):.1f} Hz)")
         
         # Plot fundamental if available
         ax2 = self.figure.add_subplot(312)
         if hasattr(self, 'fundamental'):
             ax2.plot(t, self.fundamental, 'g')
-            ax2.set_title(f"Fundamental Component ({self.f0:.1f} Hz)")
+            if self.track_pitch.isChecked() and self.f0_track is not None:
+                ax2.set_title("Fundamental Component (pitch tracked)")
+            else:
+                ax2.set_title(f"Fundamental Component ({self.f0:.1f} Hz)")
         else:
             ax2.set_title("Fundamental Component (Not calculated)")
         ax2.set_ylabel("Amplitude")
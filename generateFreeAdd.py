@@ -18,7 +18,7 @@ from queue import Queue
 import threading
 
 from auxiliar import Auxiliar
-from controlMenu import ControlMenu
+from generatorStream import AdditiveStream, StreamPlayer
 from help import Help
 
 class FreeAdditionPureTones(QDialog):
@@ -39,6 +39,8 @@ class FreeAdditionPureTones(QDialog):
         self.pianoOpen = False
         self.amp_sliders = []
         self.freq_spinboxes = []
+        self.additive_stream = None
+        self.player = None
 
         # Initialize audio storage
         self.full_audio = np.empty(1)  # Will store the complete generated audio
@@ -140,6 +142,19 @@ class FreeAdditionPureTones(QDialog):
             btn_layout.addWidget(btn)
             if text == 'Piano':  # Store reference to piano button
                 self.piano_btn = btn
+
+        self.stream_btn = QPushButton('▶ Stream')
+        self.stream_btn.setCheckable(True)
+        self.stream_btn.setMaximumWidth(90)
+        self.stream_btn.setToolTip('Play the tones continuously; frequency and amplitude changes apply live')
+        self.stream_btn.toggled.connect(self.toggleStream)
+        btn_layout.addWidget(self.stream_btn)
+
+        # Push live changes to the stream while it is playing
+        for sb in self.freq_spinboxes:
+            sb.valueChanged.connect(self.updateStream)
+        for slider in self.amp_sliders:
+            slider.valueChanged.connect(self.updateStream)
         
         # Add to main layout with stretch factors to give more space to plot
         main_layout.addWidget(control_panel, 0)  # 0 stretch factor - fixed height
@@ -619,6 +634,7 @@ class FreeAdditionPureTones(QDialog):
                 self.controller.adse.advancedSettings = lambda: print("Advanced settings not available")
             
             # Create new control window
+            from controlMenu import ControlMenu  # Heavy (librosa, scipy): imported on first use
             control_window = ControlMenu(title, self.fs, audio_to_load, duration, self.controller)
             
             # Store reference to the control window
@@ -646,8 +662,40 @@ class FreeAdditionPureTones(QDialog):
         minutes, seconds = divmod(seconds, 60)
         return f"{int(minutes):02d}:{seconds:06.3f}"
 
+    def toggleStream(self, checked):
+        """Play the current set of tones continuously"""
+        if not checked:
+            self.stopStream()
+            return
+
+        try:
+            sd.stop()
+            self.additive_stream = AdditiveStream(self.fs, self.getFrequencies(), self.getAmplitudes())
+            self.player = StreamPlayer(self.additive_stream, self.fs)
+            self.player.start()
+            self.stream_btn.setText('⏹ Stop')
+        except Exception as e:
+            self.stopStream()
+            self.stream_btn.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Could not start stream: {str(e)}")
+
+    def updateStream(self):
+        if self.additive_stream is not None:
+            self.additive_stream.set_params(self.getFrequencies(), self.getAmplitudes())
+
+    def stopStream(self):
+        if self.player is not None:
+            self.player.stop()
+        self.player = None
+        self.additive_stream = None
+        self.stream_btn.setText('▶ Stream')
+
+    def cleanup(self):
+        self.stopStream()
+
     def closeEvent(self, event):
         """Clean up when closing"""
+        self.stopStream()
         self.audio_queue.put((None, None))  # Stop audio thread
         super().closeEvent(event)
 
@@ -8,9 +8,9 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.widgets import SpanSelector
 import sounddevice as sd
-import colorednoise as cn  # Ensure this is installed
 from auxiliar import Auxiliar
-from controlMenu import ControlMenu
+from noiseStream import ColoredNoiseStream
+from generatorStream import StreamPlayer
 
 class Noise(QWidget):
     def __init__(self, master, controller):
@@ -19,6 +19,8 @@ class Noise(QWidget):
         self.master = master
         self.aux = Auxiliar()
         self.selectedAudio = np.empty(1)
+        self.noise_stream = None
+        self.player = None
         self.setup_ui()
 
     def setup_ui(self):
@@ -76,12 +78,16 @@ class Noise(QWidget):
         # Buttons
         button_layout = QHBoxLayout()
         self.plot_button = QPushButton('Plot')
+        self.stream_button = QPushButton('▶ Stream')
+        self.stream_button.setCheckable(True)
+        self.stream_button.setToolTip('Play the selected noise continuously until stopped')
         self.controller_button = QPushButton('Load to Controller')
         self.save_button = QPushButton('Save')
         self.help_button = QPushButton('🛈')
         self.help_button.setFixedWidth(30)
         button_layout.addWidget(self.save_button)
         button_layout.addStretch()
+        button_layout.addWidget(self.stream_button)
         button_layout.addWidget(self.controller_button)
         button_layout.addWidget(self.help_button)
         button_layout.addWidget(self.plot_button)
@@ -101,6 +107,8 @@ class Noise(QWidget):
         self.ampl_entry.editingFinished.connect(self.update_amplitude_from_entry)
         self.dura_entry.editingFinished.connect(self.update_duration_from_entry)
         self.plot_button.clicked.connect(self.plot_noise)
+        self.stream_button.toggled.connect(self.toggle_stream)
+        self.type_combo.currentTextChanged.connect(self.update_stream_type)
         self.controller_button.clicked.connect(self.load_to_controller)
         self.save_button.clicked.connect(self.save_default_values)
         self.help_button.clicked.connect(lambda: self.controller.help.createHelpMenu(5))
@@ -133,6 +141,7 @@ class Noise(QWidget):
                 self.controller.adse.advancedSettings = lambda: print("Advanced settings not available")
             
             # Create controller window
+            from controlMenu import ControlMenu  # Heavy (librosa, scipy): imported on first use
             control_window = ControlMenu(title, fs, audio_to_load, duration, self.controller)
             
             # Track windows
@@ -157,6 +166,8 @@ class Noise(QWidget):
     def update_amplitude(self, value):
         self.amplitude = value / 100
         self.ampl_entry.setText(f"{self.amplitude:.2f}")
+        if self.noise_stream is not None:
+            self.noise_stream.amplitude = self.amplitude
 
     def update_duration(self, value):
         self.duration = value / 100
@@ -211,11 +222,9 @@ class Noise(QWidget):
         choice = self.type_combo.currentText()
         samples = int(self.duration * self.fs)
 
-        beta = {"White noise": 0, "Pink noise": 1, "Brown noise": 2}.get(choice, 1)
-
         self.time = np.linspace(0, self.duration, samples, endpoint=False)
-        noise_raw = cn.powerlaw_psd_gaussian(beta, samples)
-        self.audio = self.amplitude * noise_raw / max(abs(noise_raw))
+        generator = ColoredNoiseStream(choice, self.fs, self.amplitude)
+        self.audio = generator.render(self.duration)
 
         self.ax.clear()
         self.ax.plot(self.time, self.audio)
@@ -233,3 +242,47 @@ class Noise(QWidget):
         ini, end = np.searchsorted(self.time, (xmin, xmax))
         self.selectedAudio = self.audio[ini:end + 1]
         sd.play(self.selectedAudio, self.fs)
+
+    def toggle_stream(self, checked):
+        """Start or stop continuous playback of the selected noise"""
+        if checked:
+            self.start_stream()
+        else:
+            self.stop_stream()
+
+    def start_stream(self):
+        self.stop_stream()
+        try:
+            fs = int(self.fs_entry.text())
+        except ValueError:
+            fs = self.fs
+
+        self.noise_stream = ColoredNoiseStream(self.type_combo.currentText(), fs, self.amplitude)
+        self.player = StreamPlayer(self.noise_stream, fs)
+        try:
+            self.player.start()
+            self.stream_button.setText('⏹ Stop')
+        except Exception as e:
+            self.player = None
+            self.noise_stream = None
+            self.stream_button.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Could not start noise stream: {str(e)}")
+
+    def stop_stream(self):
+        if self.player is not None:
+            self.player.stop()
+        self.player = None
+        self.noise_stream = None
+        self.stream_button.setText('▶ Stream')
+
+    def update_stream_type(self, noise_type):
+        """Switch the running stream to a new noise colour"""
+        if self.player is not None:
+            self.start_stream()
+
+    def cleanup(self):
+        self.stop_stream()
+        if self.stream_button.isChecked():
+            self.stream_button.blockSignals(True)
+            self.stream_button.setChecked(False)
+            self.stream_button.blockSignals(False)
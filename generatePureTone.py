@@ -11,7 +11,7 @@ from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navigatio
 from matplotlib.widgets import SpanSelector, Button, RadioButtons
 from pitchAdvancedSettings import AdvancedSettings
 from auxiliar import Auxiliar
-from controlMenu import ControlMenu
+from generatorStream import ToneStream, StreamPlayer
 from help import Help
 from pathlib import Path
 import numpy as np
@@ -33,6 +33,8 @@ class PureTone(QDialog):
             'phase': 0.0
         }
         self.sliders = {}
+        self.tone_stream = None
+        self.player = None
         
         self.setupUI()
         self.plotPureTone()
@@ -149,6 +151,11 @@ class PureTone(QDialog):
         btn_layout = QHBoxLayout()
         btn_layout.addWidget(QPushButton('Save', clicked=self.saveDefaults))
         btn_layout.addWidget(QPushButton('Load to Controller', clicked=self.load_to_controller))
+        self.stream_button = QPushButton('▶ Stream')
+        self.stream_button.setCheckable(True)
+        self.stream_button.setToolTip('Play the tone continuously; sliders change it live')
+        self.stream_button.toggled.connect(self.toggle_stream)
+        btn_layout.addWidget(self.stream_button)
         btn_layout.addStretch(1)
         btn_layout.addWidget(QPushButton('Default Values', clicked=self.reset_to_defaults))
         btn_layout.addWidget(QPushButton('🛈 Help', clicked=self.showHelp))
@@ -185,6 +192,7 @@ class PureTone(QDialog):
                 self.controller.adse.advancedSettings = lambda: print("Advanced settings not available")
             
             # Create new control window
+            from controlMenu import ControlMenu  # Heavy (librosa, scipy): imported on first use
             control_window = ControlMenu(title, fs, audio_to_load, duration, self.controller)
             
             # Store reference to the control window if needed (similar to inputLoad.py)
@@ -301,8 +309,47 @@ class PureTone(QDialog):
 
     def update_plot(self):
         self.plotPureTone()
+        if self.tone_stream is not None:
+            self.tone_stream.set_params(**self.stream_params())
 
 
+    def stream_params(self):
+        """Current slider values in the form expected by ToneStream"""
+        return {
+            'frequency': self.sliders['Frequency (Hz)'].value(),
+            'amplitude': self.sliders['Amplitude'].value() / 100,
+            'phase': self.sliders['Phase (π rad)'].value() / 100,
+            'offset': self.sliders['Offset'].value() / 100
+        }
+
+    def toggle_stream(self, checked):
+        """Play the tone continuously; slider changes are applied live"""
+        if not checked:
+            self.stop_stream()
+            return
+
+        fs = self.default_values['fs']
+        try:
+            sd.stop()
+            self.tone_stream = ToneStream('sine', fs, **self.stream_params())
+            self.player = StreamPlayer(self.tone_stream, fs)
+            self.player.start()
+            self.stream_button.setText('⏹ Stop')
+        except Exception as e:
+            self.stop_stream()
+            self.stream_button.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Could not start stream: {str(e)}")
+
+    def stop_stream(self):
+        if self.player is not None:
+            self.player.stop()
+        self.player = None
+        self.tone_stream = None
+        self.stream_button.setText('▶ Stream')
+
+    def cleanup(self):
+        self.stop_stream()
+
     def saveDefaults(self):
         # Implement your save functionality here
         pass
@@ -315,5 +362,6 @@ class PureTone(QDialog):
         name = "Pure Tone"
         
         # Create ControlMenu with required parameters
+        from controlMenu import ControlMenu
         self.cm = ControlMenu(name, fs, signal, duration, self.controller)
         self.cm.show()
\ No newline at end of file
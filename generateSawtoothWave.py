@@ -11,7 +11,7 @@ from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navigatio
 from matplotlib.widgets import SpanSelector, Button, RadioButtons
 
 from auxiliar import Auxiliar
-from controlMenu import ControlMenu
+from generatorStream import ToneStream, StreamPlayer
 from scipy import signal
 
 class SawtoothWave(QWidget):
@@ -30,6 +30,8 @@ class SawtoothWave(QWidget):
             'maxpos': 1.0
         }
         self.sliders = {}
+        self.tone_stream = None
+        self.player = None
 
         self.setupUI()
         self.plotSawtoothWave()
@@ -115,11 +117,15 @@ class SawtoothWave(QWidget):
         self.help_button = QPushButton('🛈')
         self.controller_button = QPushButton('Load to Controller')
         self.plot_button = QPushButton('Plot')
+        self.stream_button = QPushButton('▶ Stream')
+        self.stream_button.setCheckable(True)
+        self.stream_button.setToolTip('Play the wave continuously; sliders change it live')
         
         self.help_button.setFixedWidth(30)
         
         btn_layout.addWidget(self.save_button)
         btn_layout.addStretch(1)
+        btn_layout.addWidget(self.stream_button)
         btn_layout.addWidget(self.controller_button)
         btn_layout.addWidget(self.help_button)
         btn_layout.addWidget(self.plot_button)
@@ -129,6 +135,7 @@ class SawtoothWave(QWidget):
         self.plot_button.clicked.connect(self.plotSawtoothWave)
         self.controller_button.clicked.connect(self.load_to_controller)
         self.save_button.clicked.connect(self.saveDefaults)
+        self.stream_button.toggled.connect(self.toggle_stream)
         
         layout.addLayout(btn_layout, len(self.sliders), 1, 1, 3)
         
@@ -228,6 +235,7 @@ class SawtoothWave(QWidget):
                 self.controller.adse.advancedSettings = lambda: print("Advanced settings not available")
 
             # Create and show the controller window
+            from controlMenu import ControlMenu  # Heavy (librosa, scipy): imported on first use
             control_window = ControlMenu(title, fs, audio_to_load, duration, self.controller)
 
             # Optional: Track and clean up the controller window
@@ -250,6 +258,46 @@ class SawtoothWave(QWidget):
 
     def update_plot(self):
         self.plotSawtoothWave()
+        if self.tone_stream is not None:
+            self.tone_stream.set_params(**self.stream_params())
+
+    def stream_params(self):
+        """Current slider values in the form expected by ToneStream"""
+        return {
+            'frequency': self.sliders['Frequency (Hz)'].value(),
+            'amplitude': self.sliders['Amplitude'].value() / 100,
+            'phase': self.sliders['Phase (π rad)'].value() / 100,
+            'offset': self.sliders['Offset'].value() / 100,
+            'shape': self.sliders['Max Position'].value() / 100
+        }
+
+    def toggle_stream(self, checked):
+        """Play the sawtooth wave continuously; slider changes are applied live"""
+        if not checked:
+            self.stop_stream()
+            return
+
+        fs = self.default_values['fs']
+        try:
+            sd.stop()
+            self.tone_stream = ToneStream('sawtooth', fs, **self.stream_params())
+            self.player = StreamPlayer(self.tone_stream, fs)
+            self.player.start()
+            self.stream_button.setText('⏹ Stop')
+        except Exception as e:
+            self.stop_stream()
+            self.stream_button.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Could not start stream: {str(e)}")
+
+    def stop_stream(self):
+        if self.player is not None:
+            self.player.stop()
+        self.player = None
+        self.tone_stream = None
+        self.stream_button.setText('▶ Stream')
+
+    def cleanup(self):
+        self.stop_stream()
 
     def saveDefaults(self):
         # Implement your save functionality here
@@ -261,6 +309,7 @@ class SawtoothWave(QWidget):
         signal = self.selectedAudio
         name = "Sawtooth Wave"
         
+        from controlMenu import ControlMenu
         self.cm = ControlMenu(name, fs, signal, duration, self.controller)
         self.cm.show()
 
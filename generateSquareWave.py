@@ -8,7 +8,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.widgets import SpanSelector
 from scipy import signal
-from controlMenu import ControlMenu
+from generatorStream import ToneStream, StreamPlayer
 
 class SquareWave(QWidget):
     def __init__(self, master, controller):
@@ -26,6 +26,8 @@ class SquareWave(QWidget):
             'duty': 0.5  # Changed from maxpos to duty for square wave
         }
         self.sliders = {}
+        self.tone_stream = None
+        self.player = None
 
         self.setupUI()
         self.plotSquareWave()
@@ -109,11 +111,15 @@ class SquareWave(QWidget):
         self.help_button = QPushButton('🛈')
         self.controller_button = QPushButton('Load to Controller')
         self.plot_button = QPushButton('Plot')
+        self.stream_button = QPushButton('▶ Stream')
+        self.stream_button.setCheckable(True)
+        self.stream_button.setToolTip('Play the wave continuously; sliders change it live')
         
         self.help_button.setFixedWidth(30)
         
         btn_layout.addWidget(self.save_button)
         btn_layout.addStretch(1)
+        btn_layout.addWidget(self.stream_button)
         btn_layout.addWidget(self.controller_button)
         btn_layout.addWidget(self.help_button)
         btn_layout.addWidget(self.plot_button)
@@ -122,6 +128,7 @@ class SquareWave(QWidget):
         self.plot_button.clicked.connect(self.plotSquareWave)
         self.controller_button.clicked.connect(self.load_to_controller)
         self.save_button.clicked.connect(self.saveDefaults)
+        self.stream_button.toggled.connect(self.toggle_stream)
         
         layout.addLayout(btn_layout, len(self.sliders), 1, 1, 3)
         
@@ -153,6 +160,7 @@ class SquareWave(QWidget):
                 self.controller.adse.advancedSettings = lambda: print("Advanced settings not available")
             
             # Create controller window
+            from controlMenu import ControlMenu  # Heavy (librosa, scipy): imported on first use
             control_window = ControlMenu(title, fs, audio_to_load, duration, self.controller)
             
             # Track window for cleanup
@@ -243,6 +251,46 @@ class SquareWave(QWidget):
 
     def update_plot(self):
         self.plotSquareWave()
+        if self.tone_stream is not None:
+            self.tone_stream.set_params(**self.stream_params())
+
+    def stream_params(self):
+        """Current slider values in the form expected by ToneStream"""
+        return {
+            'frequency': self.sliders['Frequency (Hz)'].value(),
+            'amplitude': self.sliders['Amplitude'].value() / 100,
+            'phase': self.sliders['Phase (π rad)'].value() / 100,
+            'offset': self.sliders['Offset'].value() / 100,
+            'shape': self.sliders['Duty Cycle'].value() / 100
+        }
+
+    def toggle_stream(self, checked):
+        """Play the square wave continuously; slider changes are applied live"""
+        if not checked:
+            self.stop_stream()
+            return
+
+        fs = self.default_values['fs']
+        try:
+            sd.stop()
+            self.tone_stream = ToneStream('square', fs, **self.stream_params())
+            self.player = StreamPlayer(self.tone_stream, fs)
+            self.player.start()
+            self.stream_button.setText('⏹ Stop')
+        except Exception as e:
+            self.stop_stream()
+            self.stream_button.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Could not start stream: {str(e)}")
+
+    def stop_stream(self):
+        if self.player is not None:
+            self.player.stop()
+        self.player = None
+        self.tone_stream = None
+        self.stream_button.setText('▶ Stream')
+
+    def cleanup(self):
+        self.stop_stream()
 
     def saveDefaults(self):
         # Implement your save functionality here
@@ -254,6 +302,7 @@ class SquareWave(QWidget):
         signal = self.selectedAudio
         name = "Square Wave"
         
+        from controlMenu import ControlMenu
         self.cm = ControlMenu(name, fs, signal, duration, self.controller)
         self.cm.show()
 
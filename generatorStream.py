@@ -0,0 +1,152 @@
+import numpy as np
+import sounddevice as sd
+from scipy import signal
+
+
+class ToneStream:
+    """Phase-continuous sine/square/sawtooth source rendered block by block.
+
+    Parameters set with set_params() are reached by a linear ramp across the
+    next block instead of jumping, and the phase is accumulated from the
+    instantaneous frequency, so moving a slider while the stream is playing
+    does not produce clicks.
+    """
+
+    WAVEFORMS = ('sine', 'square', 'sawtooth')
+
+    def __init__(self, waveform='sine', fs=44100, frequency=440.0, amplitude=0.5,
+                 phase=0.0, offset=0.0, shape=0.5, block_size=1024):
+        if waveform not in self.WAVEFORMS:
+            raise ValueError(f"Unknown waveform: {waveform}")
+
+        self.waveform = waveform
+        self.fs = fs
+        self.block_size = block_size
+
+        # shape is the duty cycle for square waves and the ramp width for sawtooth
+        self._target = {
+            'frequency': float(frequency),
+            'amplitude': float(amplitude),
+            'phase': float(phase),
+            'offset': float(offset),
+            'shape': float(shape)
+        }
+        self._current = dict(self._target)
+        self._cycles = 0.0  # Running phase in cycles, kept in [0, 1)
+
+    def set_params(self, **params):
+        """Change parameters live; safe to call from the GUI while streaming"""
+        target = dict(self._target)
+        target.update({name: float(value) for name, value in params.items()})
+        # Swap the whole dict so the audio thread never sees a half-updated one
+        self._target = target
+
+    def _ramps(self, frames):
+        target = self._target
+        ramp = np.arange(1, frames + 1) / frames
+        ramps = {}
+        for name, end in target.items():
+            start = self._current[name]
+            ramps[name] = start + (end - start) * ramp if start != end else np.full(frames, end)
+        self._current = dict(target)
+        return ramps
+
+    def _advance(self, frequency):
+        """Integrate the instantaneous frequency into a phase (in cycles) per sample"""
+        increment = frequency / self.fs
+        cycles = self._cycles + np.cumsum(increment) - increment
+        self._cycles = float((self._cycles + increment.sum()) % 1.0)
+        return cycles
+
+    def read(self, frames):
+        params = self._ramps(frames)
+        angle = 2 * np.pi * self._advance(params['frequency']) + params['phase'] * np.pi
+
+        if self.waveform == 'square':
+            wave = signal.square(angle, duty=np.clip(params['shape'], 0.0, 1.0))
+        elif self.waveform == 'sawtooth':
+            wave = signal.sawtooth(angle, width=np.clip(params['shape'], 0.0, 1.0))
+        else:
+            wave = np.cos(angle)
+
+        block = params['amplitude'] * wave + params['offset']
+        np.clip(block, -1.0, 1.0, out=block)
+        return block.astype(np.float32)
+
+
+class AdditiveStream:
+    """Sum of pure tones with one phase accumulator per partial"""
+
+    def __init__(self, fs=44100, frequencies=(), amplitudes=(), block_size=1024):
+        self.fs = fs
+        self.block_size = block_size
+        self._target = (np.asarray(frequencies, dtype=float), np.asarray(amplitudes, dtype=float))
+        self._current = self._target
+        self._cycles = np.zeros(len(self._target[0]))
+
+    def set_params(self, frequencies, amplitudes):
+        """Change partial frequencies/amplitudes live (same number of partials)"""
+        self._target = (np.asarray(frequencies, dtype=float), np.asarray(amplitudes, dtype=float))
+
+    def read(self, frames):
+        target = self._target
+        target_freqs, target_amps = target
+        if len(target_freqs) != len(self._cycles):
+            self._current = target
+            self._cycles = np.zeros(len(target_freqs))
+        current_freqs, current_amps = self._current
+        self._current = target
+
+        ramp = np.arange(1, frames + 1) / frames
+        freqs = current_freqs[:, None] + (target_freqs - current_freqs)[:, None] * ramp
+        amps = current_amps[:, None] + (target_amps - current_amps)[:, None] * ramp
+
+        increment = freqs / self.fs
+        cycles = self._cycles[:, None] + np.cumsum(increment, axis=1) - increment
+        self._cycles = (self._cycles + increment.sum(axis=1)) % 1.0
+
+        block = np.sum(amps * np.sin(2 * np.pi * cycles), axis=0)
+
+        # Keep the sum inside full scale without changing the balance of partials
+        block /= np.maximum(1.0, np.sum(np.abs(amps), axis=0))
+        return block.astype(np.float32)
+
+
+class StreamPlayer:
+    """Plays any object with a read(frames) method through a sounddevice OutputStream"""
+
+    def __init__(self, source, fs, channels=1):
+        self.source = source
+        self.fs = fs
+        self.channels = channels
+        self.stream = None
+
+    @property
+    def active(self):
+        return self.stream is not None
+
+    def callback(self, outdata, frames, time_info, status):
+        block = self.source.read(frames)
+        outdata[:, 0] = block
+        if self.channels > 1:
+            outdata[:, 1:] = outdata[:, :1]
+
+    def start(self):
+        self.stop()
+        self.stream = sd.OutputStream(
+            samplerate=self.fs,
+            channels=self.channels,
+            dtype='float32',
+            blocksize=getattr(self.source, 'block_size', 1024),
+            callback=self.callback
+        )
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                print(f"Error stopping stream: {e}")
+            self.stream = None
@@ -0,0 +1,121 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import rfft, irfft, rfftfreq
+from scipy.signal import windows
+
+N_FFT = 4096          # Analysis frame length (samples)
+CHUNK_FRAMES = 128    # Frames transformed per batch, bounds the working memory
+TRACK_N_FFT = 2048    # Shorter frames for pitch-tracked masks (follow vibrato)
+
+
+def sqrt_hann(n_fft):
+    """Square-root periodic Hann: analysis x synthesis sums to 1 at 50% overlap"""
+    return np.sqrt(windows.hann(n_fft, sym=False))
+
+
+def harmonic_masks(freqs, f0, n_harmonics, bandwidth=None):
+    """Return a (n_harmonics, len(freqs)) binary mask, one row per harmonic.
+
+    Harmonic k keeps the bins within bandwidth/2 of k * f0. The default
+    bandwidth is f0, which splits the spectrum into adjacent bands.
+    """
+    if bandwidth is None:
+        bandwidth = f0
+    centers = f0 * np.arange(1, n_harmonics + 1)
+    return (np.abs(freqs[None, :] - centers[:, None]) <= bandwidth / 2).astype(float)
+
+
+def mask_bands(audio, masks, n_fft=N_FFT, chunk_frames=CHUNK_FRAMES, n_bands=None):
+    """Split audio into several signals with one STFT pass.
+
+    The signal is analysed with a sqrt-Hann window at 50% overlap; every
+    frame spectrum is multiplied by all the masks at once, inverted and
+    overlap-added. masks is either a fixed (n_bands, n_bins) array or a
+    callable masks(first_frame, count) returning (n_bands, count, n_bins)
+    for time-varying masks (then n_bands must be given). Frame i is centred
+    on sample i * n_fft // 2. Returns an array of shape (n_bands, len(audio)).
+    """
+    audio = np.asarray(audio, dtype=float)
+    if callable(masks):
+        frame_masks = masks
+    else:
+        fixed = np.atleast_2d(masks)[:, None, :]
+        n_bands = len(fixed)
+        frame_masks = lambda first, count: fixed
+    hop = n_fft // 2
+    window = sqrt_hann(n_fft)
+
+    # One hop of zeros before the signal so its first samples get two frames
+    n_frames = int(np.ceil(len(audio) / hop)) + 1
+    padded = np.zeros((n_frames + 1) * hop)
+    padded[hop:hop + len(audio)] = audio
+    frames = sliding_window_view(padded, n_fft)[::hop]
+
+    out = np.zeros((n_bands, len(padded)))
+    for start in range(0, n_frames, chunk_frames):
+        chunk = frames[start:start + chunk_frames]
+        count = len(chunk)
+        spectra = rfft(chunk * window, axis=-1)
+        y = irfft(spectra[None, :, :] * frame_masks(start, count), n_fft, axis=-1) * window
+
+        # 50% overlap: the first half of each frame lands on the second half
+        # of the previous one
+        halves = y.reshape(n_bands, count, 2, hop)
+        pos = start * hop
+        out[:, pos:pos + count * hop] += halves[:, :, 0].reshape(n_bands, -1)
+        out[:, pos + hop:pos + (count + 1) * hop] += halves[:, :, 1].reshape(n_bands, -1)
+
+    return out[:, hop:hop + len(audio)]
+
+
+def harmonic_bank(audio, fs, f0, n_harmonics=8, bandwidth=None, n_fft=N_FFT):
+    """Split audio into its first n_harmonics harmonics of f0 in one pass.
+
+    Returns (bands, centers): bands has shape (n_harmonics, len(audio)) and
+    centers holds the centre frequency of each band. Harmonics above the
+    Nyquist frequency are dropped.
+    """
+    n_harmonics = max(1, min(int(n_harmonics), int((fs / 2) // f0)))
+    freqs = rfftfreq(n_fft, 1 / fs)
+    masks = harmonic_masks(freqs, f0, n_harmonics, bandwidth)
+    bands = mask_bands(audio, masks, n_fft)
+    return bands, f0 * np.arange(1, n_harmonics + 1)
+
+
+def fill_unvoiced(f0_track):
+    """Forward-fill NaN frames of a pitch track (leading NaNs take the first value)"""
+    f0_track = np.asarray(f0_track, dtype=float)
+    voiced = np.isfinite(f0_track)
+    if not voiced.any():
+        return f0_track.copy()
+    last = np.where(voiced, np.arange(len(f0_track)), 0)
+    np.maximum.accumulate(last, out=last)
+    filled = f0_track[last]
+    filled[:np.argmax(voiced)] = f0_track[np.argmax(voiced)]
+    return filled
+
+
+def separate_tracked(audio, fs, times, f0_track, bandwidth, n_fft=TRACK_N_FFT):
+    """Split audio into (fundamental, harmonics) following a pitch track.
+
+    Every STFT frame keeps the bins within bandwidth/2 of the f0 at its
+    centre as the fundamental and everything else as the harmonics, so the
+    two outputs add up to the input. Unvoiced frames hold the last f0.
+    """
+    f0_track = fill_unvoiced(f0_track)
+    if not np.isfinite(f0_track).any():
+        raise ValueError("The pitch track has no voiced frames")
+
+    hop = n_fft // 2
+    freqs = rfftfreq(n_fft, 1 / fs)
+    # Never narrower than the bin spacing, or the fundamental could fall between bins
+    half_width = max(bandwidth / 2, fs / n_fft)
+
+    def frame_masks(first, count):
+        centres = (first + np.arange(count)) * hop / fs
+        f0 = np.interp(centres, times, f0_track)
+        fundamental = (np.abs(freqs[None, :] - f0[:, None]) <= half_width).astype(float)
+        return np.stack([fundamental, 1.0 - fundamental])
+
+    fundamental, harmonics = mask_bands(audio, frame_masks, n_fft, n_bands=2)
+    return fundamental, harmonics
@@ -1,12 +1,37 @@
 import os
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QRadioButton, 
-                            QWidget, QFrame, QLabel)
+                            QWidget, QFrame, QLabel, QTextBrowser)
 from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtCore import QUrl
 
 
+def create_html_view():
+    """Viewer for the help pages, created on first use.
+
+    QtWebEngine (Chromium) is only imported here, the first time help is
+    opened, so it costs nothing at startup. Without it (not installed, or
+    no GL context sharing) the static pages are shown in a QTextBrowser.
+    """
+    try:
+        from PyQt5.QtWebEngineWidgets import QWebEngineView
+        return QWebEngineView()
+    except ImportError as e:
+        print(f"QtWebEngine unavailable, using the basic help viewer: {e}")
+        browser = QTextBrowser()
+        browser.setOpenExternalLinks(True)
+        return browser
+
+
+def set_view_html(view, html, base_dir=''):
+    """Show html in a view from create_html_view, resolving relative links from base_dir"""
+    if isinstance(view, QTextBrowser):
+        view.setSearchPaths([base_dir] if base_dir else [])
+        view.setHtml(html)
+    else:
+        view.setHtml(html, QUrl.fromLocalFile(base_dir + '/' if base_dir else ''))
+
+
 class Help(QWidget):
     def __init__(self, controller, parent=None):
         super().__init__(parent)
@@ -54,7 +79,7 @@ class Help(QWidget):
             main_layout.addWidget(left_panel)
             
             # Right panel for HTML content
-            self.web_view = QWebEngineView()
+            self.web_view = create_html_view()
             main_layout.addWidget(self.web_view, 1)
             
             self.help_window.setLayout(main_layout)
@@ -95,8 +120,7 @@ class Help(QWidget):
                     html_content = file.read()
                 
                 # Set base URL for relative paths
-                base_url = QUrl.fromLocalFile(base_dir + '/')
-                self.web_view.setHtml(html_content, base_url)
+                set_view_html(self.web_view, html_content, base_dir)
                 
                 # Update radio button selection
                 for i, radio in enumerate(self.radio_group, start=1):
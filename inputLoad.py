@@ -1,7 +1,6 @@
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
-import librosa
 import struct
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QPushButton, 
@@ -13,7 +12,6 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.widgets import SpanSelector, Button
 from matplotlib.figure import Figure
-from controlMenu import ControlMenu
 from config import BASE_DIR, RECORDINGS_DIR, LIBRARY_DIR
 
 MAX_WINDOWS = 5 
@@ -88,6 +86,7 @@ class Load(QWidget):
         
         try:
             # Read audio file using librosa (supports both WAV and MP3)
+            import librosa  # Heavy (numba, scipy): imported on first load
             audio, self.fs = librosa.load(file_path, sr=None, mono=False)
             
             # Check if stereo and convert to mono if needed
@@ -114,7 +113,7 @@ class Load(QWidget):
         self.selectedAudio = np.empty(1)
         
         # Calculate time array
-        duration = librosa.get_duration(filename=self.file_path)
+        duration = len(audio) / self.fs
         time = np.linspace(0, duration, len(audio), endpoint=False)
         
         # Plot the audio
@@ -207,6 +206,7 @@ class Load(QWidget):
                 title = name
                 
             # Create new control window
+            from controlMenu import ControlMenu  # Heavy (librosa, scipy): imported on first use
             control_window = ControlMenu(title, self.fs, audio_to_load, duration, self.controller)
             
             if hasattr(self.controller, 'update_windows_menu'):
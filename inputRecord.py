@@ -1,20 +1,23 @@
 import time
-import threading
-import pyaudio
 import numpy as np
-import soundfile as sf
 import sounddevice as sd
-from scipy.io.wavfile import write
 from pathlib import Path
 from PyQt5.QtWidgets import (QSpinBox, QApplication, QWidget, QDialog, QLabel, QPushButton, 
-                            QVBoxLayout, QHBoxLayout, QMessageBox)
+                            QVBoxLayout, QHBoxLayout, QMessageBox, QCheckBox, QComboBox, QFileDialog)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont  # Added import
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
 from matplotlib.widgets import SpanSelector, Button
-from controlMenu import ControlMenu
+from recorder import FileRecorder, RotatingRecorder, InputCapture, load_session_index, memmap_wav
+from envelope import minmax_decimate
+from liveMeter import LiveInputView
+from config import RECORDINGS_DIR
+
+# Takes longer than this are plotted as a min/max envelope
+PLOT_FULL_SAMPLES = 2_000_000
+PLOT_COLUMNS = 4000
 
 
 class Record(QWidget):
@@ -26,7 +29,16 @@ class Record(QWidget):
         self.fs = 44100
         self.selectedAudio = np.empty(1)
         self.recording_start_time = 0
-        self.frames = []
+        self.recorder = None
+        self.capture = None
+        # Single takes are scratch files, deleted once a newer take replaces
+        # them; continuous sessions are kept under recordings/sessions
+        self.recording_dir = Path("wav")
+        self.sessions_dir = RECORDINGS_DIR / "sessions"
+        self.take_audio = None
+        self.session_dir = None
+        self.session_segments = []
+        self.continuous = False
         
         # Track control windows created from recordings
         self.control_windows = []
@@ -95,6 +107,10 @@ class Record(QWidget):
         self.time_label.setFont(QFont("Arial", 16, QFont.Bold))
         self.time_label.setAlignment(Qt.AlignCenter)
         self.time_label.setStyleSheet("min-width: 80px;")
+
+        # Capture health: blocks lost because the writer fell behind, and device overflows
+        self.stats_label = QLabel("Dropped: 0 | Overflows: 0")
+        self.stats_label.setFont(QFont("Arial", 10))
         
         # Max record time dropdown
         time_limit_layout = QHBoxLayout()
@@ -150,11 +166,44 @@ class Record(QWidget):
         control_row.addWidget(self.record_button)
         control_row.addWidget(self.stop_button)
         control_row.addWidget(self.time_label)
+        control_row.addWidget(self.stats_label)
         control_row.addWidget(time_limit_label)
         control_row.addWidget(self.time_spinbox)
         control_row.addWidget(self.help_button)
         control_row.addWidget(self.load_button)
         control_row.addStretch()
+
+        # Continuous mode: no time limit, rotate to a new file every N minutes or M MB
+        session_row = QHBoxLayout()
+        session_row.setSpacing(10)
+        self.continuous_check = QCheckBox("Continuous")
+        self.continuous_check.setToolTip("Record until stopped, split into segments under recordings/sessions")
+        self.continuous_check.toggled.connect(self.update_session_controls)
+        self.segment_minutes = QSpinBox()
+        self.segment_minutes.setRange(1, 720)
+        self.segment_minutes.setValue(30)
+        self.segment_minutes.setSuffix(" min")
+        self.segment_mb = QSpinBox()
+        self.segment_mb.setRange(10, 4000)
+        self.segment_mb.setValue(500)
+        self.segment_mb.setSuffix(" MB")
+        self.segment_combo = QComboBox()
+        self.segment_combo.setMinimumWidth(220)
+        self.segment_combo.currentIndexChanged.connect(self.show_segment)
+        self.segment_combo.setVisible(False)
+        self.open_session_button = QPushButton("Open Session")
+        self.open_session_button.setToolTip("Browse the segments of an earlier continuous recording")
+        self.open_session_button.clicked.connect(self.open_session)
+
+        session_row.addWidget(self.continuous_check)
+        session_row.addWidget(QLabel("Rotate every:"))
+        session_row.addWidget(self.segment_minutes)
+        session_row.addWidget(QLabel("or"))
+        session_row.addWidget(self.segment_mb)
+        session_row.addWidget(self.segment_combo)
+        session_row.addStretch()
+        session_row.addWidget(self.open_session_button)
+        self.update_session_controls(False)
         
         # Timer setup
         self.timer = QTimer(self)
@@ -171,8 +220,14 @@ class Record(QWidget):
         self.canvas.setVisible(False)
         self.toolbar.setVisible(False)
         
+        # Live level meter and scrolling waveform, only shown while recording
+        self.live_view = LiveInputView(self)
+        self.live_view.setVisible(False)
+        
         # Add everything to main layout
         main_layout.addLayout(control_row)
+        main_layout.addLayout(session_row)
+        main_layout.addWidget(self.live_view)
         main_layout.addWidget(self.toolbar)
         main_layout.addWidget(self.canvas)
         
@@ -183,15 +238,40 @@ class Record(QWidget):
         self.record_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         self.isrecording = True
-        self.frames = []
+        self.selectedAudio = np.empty(1)
+        self.continuous = self.continuous_check.isChecked()
+        self.continuous_check.setEnabled(False)
+        self.open_session_button.setEnabled(False)
+        # One file (or session folder) per take: earlier takes may still be
+        # memory-mapped by a ControlMenu
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        if self.continuous:
+            self.recorder = RotatingRecorder(self.sessions_dir / stamp, self.fs,
+                                             segment_minutes=self.segment_minutes.value(),
+                                             segment_mb=self.segment_mb.value())
+        else:
+            self.recorder = FileRecorder(self.recording_dir / f"recording_{stamp}.wav", self.fs)
+        self.capture = InputCapture(self.recorder)
+        try:
+            self.capture.start()
+        except Exception as e:
+            self.capture.stop()
+            self.isrecording = False
+            self.continuous_check.setEnabled(True)
+            self.open_session_button.setEnabled(True)
+            self.record_button.setEnabled(True)
+            self.stop_button.setEnabled(False)
+            QMessageBox.critical(self, "Error", f"Could not start recording:\n{str(e)}")
+            return
+        self.stats_label.setText("Dropped: 0 | Overflows: 0")
+        self.live_view.setVisible(True)
+        self.live_view.start(self.recorder.ring, self.fs)
         self.recording_start_time = time.time()
         
         self.timer.start(200)
-        self.max_record_time = self.time_spinbox.value()
-        self.auto_stop_timer.start(self.max_record_time * 1000)
-                
-        self.recording_thread = threading.Thread(target=self.record_audio)
-        self.recording_thread.start()
+        if not self.continuous:
+            self.max_record_time = self.time_spinbox.value()
+            self.auto_stop_timer.start(self.max_record_time * 1000)
         
     def stop_recording(self):
         if not self.isrecording:
@@ -200,58 +280,131 @@ class Record(QWidget):
         self.isrecording = False
         self.record_button.setEnabled(True)
         self.stop_button.setEnabled(False)
+        self.continuous_check.setEnabled(True)
+        self.open_session_button.setEnabled(True)
         self.timer.stop()
         self.auto_stop_timer.stop()
         
-        self.recording_thread.join()
+        self.live_view.stop()
+        self.live_view.setVisible(False)
+        self.capture.stop()
+        self.update_time_display()
         self.process_recording()
         
-    def record_audio(self):
-        audio = pyaudio.PyAudio()
-        stream = audio.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=self.fs,
-            input=True,
-            frames_per_buffer=1024
-        )
-        
-        while self.isrecording:
-            data = stream.read(1024)
-            self.frames.append(data)
-        
-        stream.stop_stream()
-        stream.close()
-        audio.terminate()
-        
     def update_time_display(self):
         duration = time.time() - self.recording_start_time
         mins, secs = divmod(int(duration), 60)
-        self.time_label.setText(f"{mins:02d}:{secs:02d}")
+        if mins >= 60:
+            hours, mins = divmod(mins, 60)
+            self.time_label.setText(f"{hours}:{mins:02d}:{secs:02d}")
+        else:
+            self.time_label.setText(f"{mins:02d}:{secs:02d}")
+        if self.capture is not None:
+            self.stats_label.setText(
+                f"Dropped: {self.capture.dropped_blocks} | Overflows: {self.capture.overflows}")
         
+    def update_session_controls(self, continuous):
+        self.time_spinbox.setEnabled(not continuous)
+        self.segment_minutes.setEnabled(continuous)
+        self.segment_mb.setEnabled(continuous)
+
     def process_recording(self):
-        rec_int = np.frombuffer(b"".join(self.frames), dtype=np.int16)
-        duration = len(rec_int) / self.fs
-        time_axis = np.linspace(0, duration, len(rec_int))
-        
-        # Save and reload as float
-        recording_dir = Path("wav")
-        recording_dir.mkdir(exist_ok=True)
-        write(recording_dir / "recording.wav", self.fs, rec_int)
-        rec_float, _ = sf.read(recording_dir / "recording.wav", dtype='float32')
+        if not self.continuous:
+            self.segment_combo.setVisible(False)
+            # The take is already on disk: map it instead of writing and re-reading it
+            self.plot_take(self.recorder.audio(), 'Recording')
+            self.discard_old_takes()
+            return
+        self.show_session(self.recorder.session_dir, self.recorder.segments)
+
+    def open_session(self):
+        """Pick a session folder and browse its segments from index.json"""
+        session_dir = QFileDialog.getExistingDirectory(self, "Open Recording Session", str(self.sessions_dir))
+        if not session_dir:
+            return
+        try:
+            index = load_session_index(session_dir)
+            segments = index['segments']
+            fs = index['samplerate']
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.critical(self, "Error", f"Could not open session:\n{str(e)}")
+            return
+        if fs != self.fs:
+            QMessageBox.warning(self, "Error", f"Session was recorded at {fs} Hz, expected {self.fs} Hz")
+            return
+        if not segments:
+            QMessageBox.warning(self, "Error", "The session has no segments")
+            return
+        self.show_session(Path(session_dir), segments)
+
+    def show_session(self, session_dir, segments):
+        """Fill the segment list of a session; selecting the last segment plots it"""
+        self.session_dir = Path(session_dir)
+        self.session_segments = segments
+        self.segment_combo.blockSignals(True)
+        self.segment_combo.clear()
+        for segment in segments:
+            minutes = segment['frames'] / self.fs / 60
+            self.segment_combo.addItem(f"{segment['file']} ({segment['start_time'][11:]}, {minutes:.1f} min)")
+        self.segment_combo.blockSignals(False)
+        self.segment_combo.setVisible(True)
+        self.segment_combo.setCurrentIndex(len(segments) - 1)
+        self.show_segment(len(segments) - 1)
+
+    def show_segment(self, number):
+        """Plot one segment of a continuous session (memory-mapped, others untouched)"""
+        if not 0 <= number < len(self.session_segments):
+            return
+        self.selectedAudio = np.empty(1)
+        segment = self.session_segments[number]
+        try:
+            audio = memmap_wav(self.session_dir / segment['file'])
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Could not read {segment['file']}:\n{str(e)}")
+            return
+        self.plot_take(audio, segment['file'])
+
+    def discard_old_takes(self):
+        """Delete the scratch files of single takes superseded by a newer one.
+
+        The most recent finished take (the timestamp in the name sorts) and a
+        take still being written are kept. Files still memory-mapped by an
+        open ControlMenu cannot be deleted on Windows; they are skipped and
+        retried later.
+        """
+        takes = sorted(self.recording_dir.glob('recording_*.wav'))
+        if self.isrecording and self.recorder.path in takes:
+            takes.remove(self.recorder.path)
+        for path in takes[:-1]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def cleanup(self):
+        self.discard_old_takes()
+
+    def plot_take(self, audio, title):
+        self.take_audio = audio
+        duration = len(audio) / self.fs
         
         self.ax.clear()
-        self.ax.plot(time_axis, rec_int)
+        if len(audio) > PLOT_FULL_SAMPLES:
+            # Long takes: min/max envelope instead of millions of points
+            envelope = minmax_decimate(audio, PLOT_COLUMNS)
+            self.ax.plot(np.linspace(0, duration, len(envelope)), envelope)
+        else:
+            self.ax.plot(np.arange(len(audio)) / self.fs, audio)
         self.ax.set(
             xlim=[0, duration],
             xlabel='Time (s)',
             ylabel='Amplitude',
-            title='Recording'
+            title=title
         )
         self.ax.axhline(y=0, color='black', linewidth=0.5, linestyle='--')
         self.ax.grid(True, linestyle=':', alpha=0.5)
         
-        self.setup_span_selector(time_axis, rec_float)
+        self.setup_span_selector(audio)
         self.canvas.setVisible(True)
         self.toolbar.setVisible(True)
         self.canvas.draw()
@@ -264,12 +417,15 @@ class Record(QWidget):
             if hasattr(self, 'selectedAudio') and len(self.selectedAudio) > 1:
                 audio_to_load = self.selectedAudio
             else:
-                audio_to_load, _ = sf.read("wav/recording.wav", dtype='float32')
+                audio_to_load = self.take_audio
             
             duration = len(audio_to_load) / self.fs
             title = f"Recording {time.strftime('%Y-%m-%d %H:%M')}"
+            if self.segment_combo.isVisible():
+                title += f" - {self.session_segments[self.segment_combo.currentIndex()]['file']}"
 
             # Create ControlMenu window
+            from controlMenu import ControlMenu  # Heavy (librosa, scipy): imported on first use
             control_window = ControlMenu(title, self.fs, audio_to_load, duration, self.controller)
             self.control_windows.append(control_window)
 
@@ -294,7 +450,7 @@ class Record(QWidget):
             QMessageBox.critical(self, "Error", f"Could not load to controller:\n{str(e)}")
 
             
-    def setup_span_selector(self, time_axis, audio):
+    def setup_span_selector(self, audio):
         if hasattr(self, 'span'):
             self.span.disconnect_events()
             del self.span
@@ -302,8 +458,8 @@ class Record(QWidget):
         def on_select(xmin, xmax):
             if len(audio) <= 1:
                 return
-            idx_min = np.argmax(time_axis >= xmin)
-            idx_max = np.argmax(time_axis >= xmax)
+            idx_min = max(0, int(xmin * self.fs))
+            idx_max = min(len(audio), int(xmax * self.fs))
             self.selectedAudio = audio[idx_min:idx_max]
             sd.play(self.selectedAudio, self.fs)
 
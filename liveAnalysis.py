@@ -0,0 +1,261 @@
+import numpy as np
+import sounddevice as sd
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QMessageBox
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from ringBuffer import AudioRingBuffer
+from pitchEstimation import YinDetector, yin_frame_length
+from frameFeatures import short_time_energy_db, spectral_centroid
+
+BLOCK_SIZE = 1024         # Frames per input callback
+RING_SECONDS = 5          # Input the GUI can fall behind before samples are dropped
+HISTORY_SECONDS = 10      # Width of the scrolling feature curves
+FRAME_INTERVAL_MS = 33    # ~30 fps
+STE_FLOOR_DB = -120
+
+
+class MicrophoneSource:
+    """Default input device feeding an AudioRingBuffer.
+
+    The sounddevice callback only copies each block into the ring; read()
+    returns everything captured since the previous call, so consumers see
+    the stream in order and any samples lost to a slow reader are counted.
+    """
+
+    def __init__(self, fs, block_size=BLOCK_SIZE, ring_seconds=RING_SECONDS):
+        self.fs = fs
+        self.block_size = block_size
+        self.ring = AudioRingBuffer(int(ring_seconds * fs))
+        self.read_seq = 0
+        self.dropped_samples = 0
+        self.overflows = 0
+        self.stream = None
+
+    def _callback(self, indata, frames, time_info, status):
+        if status.input_overflow:
+            self.overflows += 1
+        self.ring.write(indata[:, 0])
+
+    def start(self):
+        self.ring.clear()
+        self.read_seq = 0
+        self.stream = sd.InputStream(samplerate=self.fs, channels=1, dtype='float32',
+                                     blocksize=self.block_size, callback=self._callback)
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                print(f"Error stopping input stream: {e}")
+            self.stream = None
+
+    def read(self):
+        """Samples captured since the last read, oldest first"""
+        data, self.read_seq, dropped = self.ring.read_since(self.read_seq)
+        self.dropped_samples += dropped
+        return data
+
+
+class StreamingFeatures:
+    """Incremental short-time energy, spectral centroid and pitch.
+
+    Samples are pushed in blocks of any size; every `hop` samples the last
+    `window` samples are analysed with the frameFeatures functions
+    ControlMenu's STE and spectral centroid plots use. ControlMenu's pitch
+    is librosa.pyin, whose Viterbi pass needs the whole signal, so the live
+    pitch comes from a streaming YIN detector instead (pyin's first stage is
+    YIN) and is not median-smoothed. Results go into a fixed-size history,
+    so memory stays bounded however long it runs.
+    """
+
+    def __init__(self, fs, window, hop, nfft, fmin=50.0, fmax=2000.0,
+                 history_seconds=HISTORY_SECONDS):
+        self.fs = fs
+        self.window = np.asarray(window, dtype=np.float32)
+        self.size = len(self.window)
+        self.hop = max(1, int(hop))
+        self.nfft = max(int(nfft), self.size)
+        self.fmin = fmin
+        self.fmax = fmax
+        self.yin_length = max(self.size, yin_frame_length(fs, fmin))
+
+        # Columns: time (s), STE (dB), centroid (Hz), pitch (Hz, NaN if unvoiced)
+        self.history = AudioRingBuffer(int(history_seconds * fs / self.hop) + 1, 4, np.float64)
+        self._frame = np.zeros(self.size, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Forget all input and history, e.g. before a new capture after a gap"""
+        self._frame[:] = 0
+        self._fill = 0
+        self._since_hop = 0
+        self.samples_seen = 0
+        self.yin = YinDetector(self.fs, self.yin_length, self.fmin, self.fmax)
+        self.history.clear()
+
+    def push_frame(self, new):
+        n = len(new)
+        if n >= self.size:
+            self._frame[:] = new[-self.size:]
+        else:
+            self._frame[:-n] = self._frame[n:]
+            self._frame[-n:] = new
+        self._fill = min(self.size, self._fill + n)
+
+    def process(self, samples):
+        """Analyse every hop completed by `samples`; returns the number of new points"""
+        samples = np.asarray(samples, dtype=np.float32)
+        frames = []
+        times = []
+        pitch = []
+        while len(samples):
+            take = min(self.hop - self._since_hop, len(samples))
+            part = samples[:take]
+            samples = samples[take:]
+            self.push_frame(part)
+            self.yin.push(part)
+            self.samples_seen += take
+            self._since_hop = (self._since_hop + take) % self.hop
+            if self._since_hop == 0 and self._fill == self.size:
+                frames.append(self._frame * self.window)
+                times.append((self.samples_seen - self.size / 2) / self.fs)
+                pitch.append(self.yin.analyse()['frequency'])
+        if not frames:
+            return 0
+
+        windowed = np.array(frames)
+        pitch = np.array(pitch)
+        ste = short_time_energy_db(windowed)
+        centroid = spectral_centroid(windowed, self.fs, self.nfft)
+        pitch[(pitch < self.fmin) | (pitch > self.fmax)] = np.nan
+
+        self.history.write(np.column_stack([times, ste, centroid, pitch]))
+        return len(frames)
+
+    def latest(self):
+        """(times, ste, centroid, pitch) of the points still in the history"""
+        points = self.history.latest(self.history.capacity)
+        return points[:, 0], points[:, 1], points[:, 2], points[:, 3]
+
+
+class LiveAnalysisWindow(QDialog):
+    """Scrolling STE, spectral centroid and pitch of the microphone input.
+
+    Only the curves are redrawn each frame, blitted over a cached
+    background; the axes rescale (one full draw) when a curve leaves them.
+    """
+
+    def __init__(self, parent, fs, window, hop, nfft, fmin, fmax, freq_max=None):
+        super().__init__(parent)
+        self.setWindowTitle('Live Microphone Analysis')
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
+
+        self.fs = fs
+        self.source = MicrophoneSource(fs)
+        self.features = StreamingFeatures(fs, window, hop, nfft, fmin, fmax)
+        self.freq_max = freq_max if freq_max else fs / 2
+
+        self.fig = Figure(figsize=(10, 7))
+        self.canvas = FigureCanvas(self.fig)
+        self.setup_axes(fmin, fmax)
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+        self.toggle_button = QPushButton('Start')
+        self.toggle_button.setCheckable(True)
+        self.toggle_button.toggled.connect(self.toggle_capture)
+        self.stats_label = QLabel('Dropped: 0 samples')
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.toggle_button)
+        controls.addWidget(self.stats_label)
+        controls.addStretch()
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.canvas)
+        layout.addLayout(controls)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.update_frame)
+
+    def setup_axes(self, fmin, fmax):
+        self.ax_ste, self.ax_sc, self.ax_pitch = self.fig.subplots(3, 1, sharex=True)
+        self.ax_ste.set_ylabel('STE (dB)')
+        self.ax_ste.set_ylim(-100, 0)
+        self.ax_sc.set_ylabel('Centroid (Hz)')
+        self.ax_sc.set_ylim(0, self.freq_max)
+        self.ax_pitch.set_ylabel('Pitch (Hz)')
+        self.ax_pitch.set_ylim(fmin, fmax)
+        self.ax_pitch.set_xlabel('Time (s)')
+        self.ax_pitch.set_xlim(-HISTORY_SECONDS, 0)
+        for ax in (self.ax_ste, self.ax_sc, self.ax_pitch):
+            ax.grid(True, linestyle=':', alpha=0.5)
+
+        self.ste_line, = self.ax_ste.plot([], [], color='blue', linewidth=1.2, animated=True)
+        self.sc_line, = self.ax_sc.plot([], [], color='tab:orange', linewidth=1.2, animated=True)
+        self.pitch_line, = self.ax_pitch.plot([], [], '.', color='red', markersize=3, animated=True)
+        self.fig.tight_layout()
+
+    def on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_animated()
+
+    def draw_animated(self):
+        for line in (self.ste_line, self.sc_line, self.pitch_line):
+            line.axes.draw_artist(line)
+
+    def toggle_capture(self, checked):
+        if checked:
+            # A new capture is not continuous with the previous one
+            self.features.reset()
+            for line in (self.ste_line, self.sc_line, self.pitch_line):
+                line.set_data([], [])
+            try:
+                self.source.start()
+            except Exception as e:
+                self.toggle_button.setChecked(False)
+                QMessageBox.critical(self, "Error", f"Could not open the microphone: {str(e)}")
+                return
+            self.toggle_button.setText('Stop')
+            self.timer.start(FRAME_INTERVAL_MS)
+        else:
+            self.timer.stop()
+            self.source.stop()
+            self.toggle_button.setText('Start')
+
+    def update_frame(self):
+        if self.features.process(self.source.read()) == 0 or self._background is None:
+            return
+        times, ste, centroid, pitch = self.features.latest()
+        # Newest point at 0 s
+        times = times - self.features.samples_seen / self.fs
+
+        self.ste_line.set_data(times, ste)
+        self.sc_line.set_data(times, centroid)
+        self.pitch_line.set_data(times, pitch)
+        self.stats_label.setText(f"Dropped: {self.source.dropped_samples} samples, "
+                                 f"overflows: {self.source.overflows}")
+
+        # Rescale the STE axis (a full redraw) only when the curve leaves it
+        low, high = self.ax_ste.get_ylim()
+        finite = ste[np.isfinite(ste)]
+        if len(finite) and (finite.min() < low or finite.max() > high):
+            self.ax_ste.set_ylim(max(STE_FLOOR_DB, finite.min() - 10), max(finite.max() + 10, high))
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(self._background)
+        self.draw_animated()
+        self.canvas.blit(self.fig.bbox)
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.source.stop()
+        super().closeEvent(event)
@@ -0,0 +1,121 @@
+import numpy as np
+from PyQt5.QtCore import QTimer
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from envelope import minmax_decimate
+
+FRAME_INTERVAL_MS = 33   # ~30 fps
+SCROLL_SECONDS = 5       # Width of the scrolling waveform
+COLUMNS = 800            # Min/max pairs drawn across the waveform
+RMS_SECONDS = 0.3        # Integration time of the RMS meter
+METER_FLOOR_DB = -60
+PEAK_HOLD_DECAY_DB = 0.5  # Per frame
+CLIP_LEVEL = 0.999
+
+
+def to_db(value):
+    return 20 * np.log10(max(value, 10 ** (METER_FLOOR_DB / 20)))
+
+
+class LiveInputView(FigureCanvas):
+    """Peak/RMS meter and scrolling waveform fed from an AudioRingBuffer.
+
+    A QTimer in the GUI thread reads the ring buffer at a fixed frame rate;
+    the capture thread never waits on the display. Only the animated
+    artists are redrawn (blitting over a cached background).
+    """
+
+    def __init__(self, parent=None):
+        self.fig = Figure(figsize=(8, 2.2))
+        super().__init__(self.fig)
+        self.setParent(parent)
+
+        gs = self.fig.add_gridspec(1, 2, width_ratios=[6, 1])
+        self.wave_ax = self.fig.add_subplot(gs[0])
+        self.meter_ax = self.fig.add_subplot(gs[1])
+        self.setup_axes()
+
+        self.ring = None
+        self.fs = 44100
+        self.peak_hold_db = METER_FLOOR_DB
+        self._background = None
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.update_frame)
+        self.mpl_connect('draw_event', self.on_draw)
+
+    def setup_axes(self):
+        self.wave_ax.set_ylim(-1, 1)
+        self.wave_ax.set_xlim(-SCROLL_SECONDS, 0)
+        self.wave_ax.set_xlabel('Time (s)')
+        self.wave_ax.set_yticks([-1, 0, 1])
+        self.wave_ax.grid(True, linestyle=':', alpha=0.5)
+        self.wave_line, = self.wave_ax.plot([], [], color='tab:blue', linewidth=0.8, animated=True)
+
+        self.meter_ax.set_xlim(0, 2)
+        self.meter_ax.set_ylim(METER_FLOOR_DB, 0)
+        self.meter_ax.set_xticks([0.5, 1.5])
+        self.meter_ax.set_xticklabels(['Peak', 'RMS'])
+        self.meter_ax.yaxis.tick_right()
+        self.meter_ax.set_ylabel('dBFS')
+        self.meter_ax.yaxis.set_label_position('right')
+        self.peak_bar, self.rms_bar = self.meter_ax.bar(
+            [0.5, 1.5], [0, 0], bottom=METER_FLOOR_DB, width=0.8,
+            color=['tab:green', 'tab:olive'], animated=True)
+        self.hold_line, = self.meter_ax.plot([0.1, 0.9], [METER_FLOOR_DB] * 2,
+                                             color='black', linewidth=2, animated=True)
+        self.clip_text = self.meter_ax.text(1, -3, '', ha='center', va='top', color='red',
+                                            fontweight='bold', animated=True)
+        self.fig.tight_layout()
+
+    def on_draw(self, event):
+        """Re-capture the static background after every full draw (e.g. resize)"""
+        self._background = self.copy_from_bbox(self.fig.bbox)
+        self.draw_animated()
+
+    def start(self, ring, fs):
+        self.ring = ring
+        self.fs = fs
+        self.peak_hold_db = METER_FLOOR_DB
+        self.clip_text.set_text('')
+        self.draw()
+        self.timer.start(FRAME_INTERVAL_MS)
+
+    def stop(self):
+        self.timer.stop()
+        self.ring = None
+
+    def update_frame(self):
+        if self.ring is None or self._background is None:
+            return
+
+        recent = self.ring.latest(int(SCROLL_SECONDS * self.fs))
+        if len(recent) == 0:
+            return
+
+        envelope = minmax_decimate(recent, COLUMNS)
+        times = np.linspace(-len(recent) / self.fs, 0, len(envelope))
+        self.wave_line.set_data(times, envelope)
+
+        frame = recent[-max(1, int(self.fs * FRAME_INTERVAL_MS / 1000)):]
+        peak = float(np.max(np.abs(frame)))
+        rms_window = recent[-int(self.fs * RMS_SECONDS):]
+        rms = float(np.sqrt(np.mean(np.square(rms_window, dtype=np.float64))))
+
+        peak_db = to_db(peak)
+        self.peak_hold_db = max(peak_db, self.peak_hold_db - PEAK_HOLD_DECAY_DB)
+        self.peak_bar.set_height(peak_db - METER_FLOOR_DB)
+        self.peak_bar.set_color('tab:red' if peak_db > -3 else 'tab:green')
+        self.rms_bar.set_height(to_db(rms) - METER_FLOOR_DB)
+        self.hold_line.set_ydata([self.peak_hold_db] * 2)
+        if peak >= CLIP_LEVEL:
+            self.clip_text.set_text('CLIP')
+
+        self.restore_region(self._background)
+        self.draw_animated()
+        self.blit(self.fig.bbox)
+
+    def draw_animated(self):
+        for artist in (self.wave_line, self.peak_bar, self.rms_bar, self.hold_line, self.clip_text):
+            artist.axes.draw_artist(artist)
@@ -0,0 +1,123 @@
+import numpy as np
+from scipy import signal
+
+
+class ColoredNoiseStream:
+    """Block-based white/pink/brown noise source with constant memory.
+
+    Pink noise uses the Voss-McCartney algorithm (a bank of random rows that
+    are refreshed at octave-spaced rates) and brown noise a leaky integrator
+    of white noise, so every block only depends on a few numbers of state
+    carried over from the previous one. Any duration can be rendered or
+    streamed without allocating a full-length spectrum.
+    """
+
+    NOISE_TYPES = ('White noise', 'Pink noise', 'Brown noise')
+
+    # Standard deviations mapped to `amplitude`, streamed or rendered; the
+    # rare peaks beyond are clipped, so `amplitude` is the maximum level
+    CREST_FACTOR = 4.0
+
+    def __init__(self, noise_type='White noise', fs=44100, amplitude=1.0,
+                 block_size=1024, pink_rows=16, brown_leak=0.999, seed=None):
+        if noise_type not in self.NOISE_TYPES:
+            raise ValueError(f"Unknown noise type: {noise_type}")
+
+        self.noise_type = noise_type
+        self.fs = fs
+        self.amplitude = amplitude
+        self.block_size = block_size
+        self.pink_rows = pink_rows
+        self.brown_leak = brown_leak
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self):
+        """Restart the generator state (the random sequence keeps going)"""
+        self.samples_generated = 0
+
+        # Voss-McCartney state: current value of every row
+        self._rows = self.rng.standard_normal(self.pink_rows)
+
+        # Leaky integrator state for brown noise
+        self._brown_b = np.array([np.sqrt(1 - self.brown_leak ** 2)])
+        self._brown_a = np.array([1.0, -self.brown_leak])
+        self._brown_zi = np.zeros(1)
+
+    def _white(self, frames):
+        return self.rng.standard_normal(frames)
+
+    def _pink(self, frames):
+        # Sample n refreshes the row given by the number of trailing zeros of n,
+        # so row k changes every 2**(k+1) samples.
+        counter = np.arange(self.samples_generated + 1,
+                            self.samples_generated + frames + 1, dtype=np.int64)
+        lowest_bit = counter & -counter
+        row_index = np.minimum(np.log2(lowest_bit).astype(np.int64), self.pink_rows - 1)
+
+        total = self._white(frames)
+        for row in range(self.pink_rows):
+            changes = np.flatnonzero(row_index == row)
+            if changes.size == 0:
+                total += self._rows[row]
+                continue
+
+            # Forward-fill the new random values from each refresh point
+            values = np.empty(changes.size + 1)
+            values[0] = self._rows[row]
+            values[1:] = self.rng.standard_normal(changes.size)
+
+            last_change = np.zeros(frames, dtype=np.int64)
+            last_change[changes] = np.arange(1, changes.size + 1)
+            np.maximum.accumulate(last_change, out=last_change)
+            total += values[last_change]
+
+            self._rows[row] = values[-1]
+
+        return total / np.sqrt(self.pink_rows + 1)
+
+    def _brown(self, frames):
+        out, self._brown_zi = signal.lfilter(self._brown_b, self._brown_a,
+                                             self._white(frames), zi=self._brown_zi)
+        return out
+
+    def generate(self, frames):
+        """Return the next `frames` samples with unit variance (unscaled)"""
+        if self.noise_type == 'Pink noise':
+            block = self._pink(frames)
+        elif self.noise_type == 'Brown noise':
+            block = self._brown(frames)
+        else:
+            block = self._white(frames)
+
+        self.samples_generated += frames
+        return block
+
+    def scale(self, block):
+        """Scale unit-variance noise in place to the output level of read() and render()"""
+        limit = min(self.amplitude, 1.0)
+        block *= self.amplitude / self.CREST_FACTOR
+        np.clip(block, -limit, limit, out=block)
+        return block
+
+    def read(self, frames):
+        """Return the next block at the output level, as float32"""
+        return self.scale(self.generate(frames)).astype(np.float32)
+
+    def blocks(self, total_frames=None):
+        """Yield blocks of `block_size` samples; runs forever if total_frames is None"""
+        remaining = total_frames
+        while remaining is None or remaining > 0:
+            frames = self.block_size if remaining is None else min(self.block_size, remaining)
+            yield self.read(frames)
+            if remaining is not None:
+                remaining -= frames
+
+    def render(self, duration):
+        """Render a finite buffer block by block at the same level read() streams"""
+        samples = int(duration * self.fs)
+        audio = np.empty(samples)
+        for start in range(0, samples, self.block_size):
+            stop = min(start + self.block_size, samples)
+            audio[start:stop] = self.generate(stop - start)
+        return self.scale(audio)
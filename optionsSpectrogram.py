@@ -6,6 +6,23 @@ import numpy as np
 import matplotlib.pyplot as plt
 from auxiliar import Auxiliar
 
+
+def saved_colormap(on_error=None):
+    """Colormap chosen in this dialog, 'viridis' if none was saved or it can't be read.
+
+    A read error is passed to on_error if given, otherwise printed.
+    """
+    try:
+        csv_data = Auxiliar().readFromCsv()
+        if len(csv_data) > 5 and len(csv_data[5]) > 2 and csv_data[5][2]:
+            return csv_data[5][2]
+    except Exception as e:
+        if on_error is not None:
+            on_error(e)
+        else:
+            print(f"Could not load colormap preference: {e}")
+    return 'viridis'
+
 class Spectrogram(QDialog):
     def __init__(self, parent=None, controller=None):
         super().__init__(parent)
@@ -43,13 +60,8 @@ class Spectrogram(QDialog):
                     'gist_ncar'])]
 
         # Load current colormap from CSV with error handling
-        self.current_colormap = 'viridis'  # Default fallback
-        try:
-            csv_data = self.aux.readFromCsv()
-            if len(csv_data) > 5 and len(csv_data[5]) > 2:
-                self.current_colormap = csv_data[5][2]
-        except Exception as e:
-            QMessageBox.warning(self, "Warning", f"Could not load colormap preference: {str(e)}")
+        self.current_colormap = saved_colormap(
+            lambda e: QMessageBox.warning(self, "Warning", f"Could not load colormap preference: {str(e)}"))
 
         # Create UI elements
         self.create_radio_buttons()
@@ -0,0 +1,200 @@
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import rfft, irfft, next_fast_len
+from scipy.signal import windows
+
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+VOICING_THRESHOLD = 0.5   # Min. normalized autocorrelation peak of a voiced frame
+SILENCE_DB = -50          # Frames quieter than this (relative to the peak) are unvoiced
+OCTAVE_TOLERANCE = 0.9    # Earliest peak within this ratio of the best one wins
+
+
+def frame_signal(audio, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH):
+    """Return a read-only (n_frames, frame_length) view of audio, zero-padded at the end"""
+    audio = np.asarray(audio, dtype=float)
+    n_frames = max(1, int(np.ceil((len(audio) - frame_length) / hop_length)) + 1)
+    padded = np.zeros((n_frames - 1) * hop_length + frame_length)
+    padded[:min(len(audio), len(padded))] = audio[:len(padded)]
+    return sliding_window_view(padded, frame_length)[::hop_length]
+
+
+def autocorrelation(frames, max_lag):
+    """Autocorrelation of every frame up to max_lag using one batched FFT"""
+    n_fft = next_fast_len(frames.shape[-1] + max_lag)
+    spectrum = rfft(frames, n_fft, axis=-1)
+    return irfft(spectrum.real ** 2 + spectrum.imag ** 2, n_fft, axis=-1)[..., :max_lag + 1]
+
+
+def parabolic_peak(values, index):
+    """Refine integer peak positions with a parabola through the neighbours.
+
+    values is (n, m) and index (n,) with 0 < index < m - 1. Returns the
+    fractional positions and the interpolated peak heights.
+    """
+    rows = np.arange(len(index))
+    a = values[rows, index - 1]
+    b = values[rows, index]
+    c = values[rows, index + 1]
+    denom = a - 2 * b + c
+    safe = np.where(denom == 0, 1.0, denom)
+    delta = np.where(denom == 0, 0.0, 0.5 * (a - c) / safe)
+    return index + delta, b - 0.25 * (a - c) * delta
+
+
+def estimate_f0(audio, fs, fmin=50.0, fmax=2000.0, frame_length=FRAME_LENGTH,
+                hop_length=HOP_LENGTH, threshold=VOICING_THRESHOLD):
+    """Frame-wise f0 estimation with FFT autocorrelation.
+
+    Each frame is Hann-windowed and its autocorrelation is divided by that of
+    the window, which removes the taper bias. The earliest strong peak in the
+    [fs/fmax, fs/fmin] lag range gives the period; parabolic interpolation
+    refines it below one sample. Returns (times, f0_track, f0) where unvoiced
+    frames are NaN in f0_track and f0 is the median of the voiced frames
+    (NaN if there are none).
+    """
+    audio = np.asarray(audio, dtype=float)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+
+    min_lag = max(2, int(np.floor(fs / fmax)))
+    max_lag = int(np.ceil(fs / fmin))
+    # The frame has to hold at least two periods of the lowest pitch
+    frame_length = max(frame_length, 2 * max_lag)
+
+    frames = frame_signal(audio - np.mean(audio), frame_length, hop_length)
+    window = windows.hann(frame_length, sym=False)
+    ac = autocorrelation(frames * window, max_lag + 1)
+    ac_window = autocorrelation(window[None, :], max_lag + 1)[0]
+
+    energy = ac[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = (ac / energy[:, None]) / (ac_window / ac_window[0])
+    r[~np.isfinite(r)] = 0.0
+
+    # Local maxima inside the lag range; the earliest one close to the best
+    # peak is chosen to avoid picking a multiple of the period
+    search = r[:, min_lag - 1:max_lag + 2]
+    inner = search[:, 1:-1]
+    is_peak = (inner > search[:, :-2]) & (inner >= search[:, 2:])
+    best = np.max(np.where(is_peak, inner, -np.inf), axis=1)
+    candidates = is_peak & (inner >= OCTAVE_TOLERANCE * best[:, None])
+    has_peak = candidates.any(axis=1)
+    lag_index = np.argmax(candidates, axis=1) + min_lag
+
+    lag, strength = parabolic_peak(r, np.where(has_peak, lag_index, min_lag))
+
+    peak_energy = np.max(energy) if len(energy) else 0.0
+    loud = energy > peak_energy * 10 ** (SILENCE_DB / 10)
+    voiced = has_peak & loud & (strength >= threshold)
+
+    f0_track = np.full(len(frames), np.nan)
+    f0_track[voiced] = fs / lag[voiced]
+
+    times = (np.arange(len(frames)) * hop_length + frame_length / 2) / fs
+    f0 = float(np.median(f0_track[voiced])) if voiced.any() else np.nan
+    return times, f0_track, f0
+
+
+NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+YIN_THRESHOLD = 0.15
+
+
+def note_from_frequency(frequency, a4=440.0):
+    """Return (note name with octave, cents offset from that note)"""
+    midi = 69 + 12 * np.log2(frequency / a4)
+    nearest = int(np.round(midi))
+    name = f"{NOTE_NAMES[nearest % 12]}{nearest // 12 - 1}"
+    return name, 100 * (midi - nearest)
+
+
+def yin_frame_length(fs, fmin):
+    """Shortest YIN frame for pitches down to fmin: two periods, so the
+    integration window (half the frame) still covers the longest lag"""
+    return 2 * int(np.ceil(fs / fmin)) + 2
+
+
+class YinDetector:
+    """Streaming YIN pitch detector, cheap enough for an audio callback.
+
+    Blocks are pushed with process(); the detector keeps the last
+    frame_length samples in a preallocated buffer and computes the YIN
+    difference function with FFTs (O(N log N) instead of O(N^2)). The latest
+    estimate is published in `result` as a dict replaced in one assignment,
+    so the GUI thread can read it at any time. compute_ms is the cost of the
+    last analysis and analysis_ms the latency added by the frame length.
+    """
+
+    def __init__(self, fs, frame_length=4096, fmin=30.0, fmax=2000.0, threshold=YIN_THRESHOLD):
+        self.fs = fs
+        self.frame_length = frame_length
+        self.window = frame_length // 2           # Integration window W
+        self.min_lag = max(2, int(fs / fmax))
+        self.max_lag = min(self.window - 1, int(np.ceil(fs / fmin)))
+        self.threshold = threshold
+        self.n_fft = next_fast_len(frame_length + self.window)
+
+        self._buffer = np.zeros(frame_length)
+        self._lags = np.arange(1, self.max_lag + 1)
+        self.analysis_ms = 1000 * frame_length / fs
+        self.compute_ms = 0.0
+        self.result = {'frequency': np.nan, 'note': '--', 'cents': 0.0, 'confidence': 0.0}
+
+    def push(self, block):
+        n = len(block)
+        if n >= self.frame_length:
+            self._buffer[:] = block[-self.frame_length:]
+        else:
+            self._buffer[:-n] = self._buffer[n:]
+            self._buffer[-n:] = block
+
+    def difference(self, x):
+        """Cumulative mean normalized difference d'(tau) for tau = 0..max_lag"""
+        W = self.window
+        head = x[:W]
+        # r(tau) = sum_j x[j] x[j + tau] for j < W, as one FFT cross-correlation
+        spectrum = np.conj(rfft(head, self.n_fft)) * rfft(x, self.n_fft)
+        r = irfft(spectrum, self.n_fft)[:self.max_lag + 1]
+
+        energy = np.concatenate(([0.0], np.cumsum(x * x)))
+        shifted = energy[W:W + self.max_lag + 1] - energy[:self.max_lag + 1]
+        d = energy[W] + shifted - 2 * r
+
+        cmnd = np.ones_like(d)
+        running = np.cumsum(d[1:])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cmnd[1:] = np.where(running > 0, d[1:] * self._lags / running, 1.0)
+        return cmnd
+
+    def analyse(self):
+        start = time.perf_counter()
+        cmnd = self.difference(self._buffer)
+
+        # First dip under the threshold, followed down to its local minimum
+        search = cmnd[self.min_lag:self.max_lag]
+        below = np.flatnonzero(search < self.threshold)
+        if len(below):
+            lag = self.min_lag + below[0]
+            while lag + 1 < self.max_lag and cmnd[lag + 1] < cmnd[lag]:
+                lag += 1
+        else:
+            lag = self.min_lag + int(np.argmin(search))
+
+        position, value = parabolic_peak(-cmnd[None, :], np.array([lag]))
+        confidence = float(np.clip(1 + value[0], 0.0, 1.0))
+        frequency = self.fs / position[0]
+
+        if confidence >= 1 - 2 * self.threshold and np.isfinite(frequency):
+            note, cents = note_from_frequency(frequency)
+            self.result = {'frequency': frequency, 'note': note, 'cents': cents, 'confidence': confidence}
+        else:
+            self.result = {'frequency': np.nan, 'note': '--', 'cents': 0.0, 'confidence': confidence}
+        self.compute_ms = (time.perf_counter() - start) * 1000
+        return self.result
+
+    def process(self, block):
+        """Push a block and analyse the updated frame"""
+        self.push(block)
+        return self.analyse()
@@ -0,0 +1,290 @@
+import json
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import sounddevice as sd
+import soundfile as sf
+
+from ringBuffer import AudioRingBuffer, BlockQueue
+
+RING_SECONDS = 10   # Recent audio kept in memory for live displays
+BLOCK_SIZE = 1024   # Frames per input callback
+QUEUE_SECONDS = 5   # Audio the queue can hold while the writer is stalled (e.g. slow disk)
+
+SEGMENT_MINUTES = 30  # Default rotation period of continuous recordings
+SEGMENT_MB = 500      # Default rotation size of continuous recordings
+INDEX_NAME = 'index.json'
+
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def wav_data_layout(path):
+    """Parse a WAV/RF64 header and return (data_offset, n_frames, channels, format_tag, bits)"""
+    with open(path, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff not in (b'RIFF', b'RF64') or wave != b'WAVE':
+            raise ValueError(f"Not a WAV file: {path}")
+
+        fmt = None
+        data_size64 = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"No data chunk in {path}")
+            chunk_id, size = struct.unpack('<4sI', header)
+
+            if chunk_id == b'ds64':
+                _, data_size64, _ = struct.unpack('<QQQ', f.read(24))
+                f.seek(size - 24 + (size & 1), 1)
+            elif chunk_id == b'fmt ':
+                body = f.read(size)
+                format_tag, channels, _, _, block_align, bits = struct.unpack('<HHIIHH', body[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    format_tag = struct.unpack('<H', body[24:26])[0]
+                fmt = (format_tag, channels, block_align, bits)
+                if size & 1:
+                    f.seek(1, 1)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise ValueError(f"Data chunk before fmt chunk in {path}")
+                if size == 0xFFFFFFFF and data_size64 is not None:
+                    size = data_size64
+                format_tag, channels, block_align, bits = fmt
+                return f.tell(), size // block_align, channels, format_tag, bits
+            else:
+                f.seek(size + (size & 1), 1)
+
+
+def memmap_wav(path):
+    """Memory-map the samples of a 32-bit float WAV file (read-only).
+
+    The array is (frames,) for mono and (frames, channels) otherwise; only
+    the pages that are actually touched are read from disk.
+    """
+    offset, frames, channels, format_tag, bits = wav_data_layout(path)
+    if format_tag != WAVE_FORMAT_IEEE_FLOAT or bits != 32:
+        raise ValueError(f"{path} is not a 32-bit float WAV file")
+    shape = (frames,) if channels == 1 else (frames, channels)
+    if frames == 0:
+        return np.zeros(shape, dtype=np.float32)
+    return np.memmap(path, dtype='<f4', mode='r', offset=offset, shape=shape)
+
+
+class FileRecorder:
+    """Writes incoming audio blocks straight to a sound file.
+
+    WAV files are written as 32-bit float so the finished take can be
+    memory-mapped by audio() instead of being read back; FLAC (or any other
+    extension) is written as 16-bit and read with soundfile. The last
+    RING_SECONDS of audio are also kept in an AudioRingBuffer for live views.
+    """
+
+    def __init__(self, path, fs=44100, channels=1, ring_seconds=RING_SECONDS):
+        self.path = Path(path)
+        self.fs = fs
+        self.channels = channels
+        self.ring = AudioRingBuffer(int(ring_seconds * fs), channels)
+        self.frames_written = 0
+        self._file = None
+
+    @property
+    def is_float_wav(self):
+        return self.path.suffix.lower() == '.wav'
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        subtype = 'FLOAT' if self.is_float_wav else 'PCM_16'
+        self._file = sf.SoundFile(self.path, 'w', samplerate=self.fs,
+                                  channels=self.channels, subtype=subtype)
+        self.frames_written = 0
+        self.ring.clear()
+
+    def write(self, block):
+        """Append a block of float samples in [-1, 1] to the file and the ring buffer"""
+        self._file.write(block)
+        self.ring.write(block)
+        self.frames_written += len(block)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self.path
+
+    @property
+    def duration(self):
+        return self.frames_written / self.fs
+
+    def audio(self):
+        """The finished recording, memory-mapped when possible"""
+        if self.is_float_wav:
+            return memmap_wav(self.path)
+        audio, _ = sf.read(self.path, dtype='float32')
+        return audio
+
+
+class RotatingRecorder(FileRecorder):
+    """FileRecorder for unlimited sessions, split into fixed-length segments.
+
+    Segments are 32-bit float WAV files in session_dir, each one at most
+    segment_minutes long and segment_mb in size. index.json lists every
+    segment with its first frame and length; it is rewritten at every
+    rotation so an interrupted session still indexes its closed segments.
+    """
+
+    def __init__(self, session_dir, fs=44100, channels=1, segment_minutes=SEGMENT_MINUTES,
+                 segment_mb=SEGMENT_MB, ring_seconds=RING_SECONDS):
+        super().__init__(Path(session_dir) / 'segment_0001.wav', fs, channels, ring_seconds)
+        self.session_dir = Path(session_dir)
+        bytes_per_frame = 4 * channels
+        self.segment_frames = max(1, int(min(segment_minutes * 60 * fs,
+                                             segment_mb * 1024 * 1024 // bytes_per_frame)))
+        self.segments = []
+        self.complete = False
+
+    def open(self):
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.segments = []
+        self.complete = False
+        self.frames_written = 0
+        self.ring.clear()
+        self._open_segment()
+
+    def _open_segment(self):
+        self.path = self.session_dir / f"segment_{len(self.segments) + 1:04d}.wav"
+        self._file = sf.SoundFile(self.path, 'w', samplerate=self.fs,
+                                  channels=self.channels, subtype='FLOAT')
+        self.segments.append({
+            'file': self.path.name,
+            'start_frame': self.frames_written,
+            'frames': 0,
+            'start_time': time.strftime('%Y-%m-%dT%H:%M:%S')
+        })
+        self.write_index()
+
+    def write(self, block):
+        self.ring.write(block)
+        while len(block):
+            room = self.segment_frames - self.segments[-1]['frames']
+            if room == 0:
+                self._file.close()
+                self._open_segment()
+                continue
+            part = block[:room]
+            self._file.write(part)
+            self.segments[-1]['frames'] += len(part)
+            self.frames_written += len(part)
+            block = block[room:]
+
+    def close(self):
+        super().close()
+        self.complete = True
+        self.write_index()
+        return self.session_dir
+
+    def write_index(self):
+        """Atomically replace index.json with the current segment list"""
+        index = {
+            'samplerate': self.fs,
+            'channels': self.channels,
+            'segment_frames': self.segment_frames,
+            'complete': self.complete,
+            'segments': self.segments
+        }
+        tmp = self.session_dir / (INDEX_NAME + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp, self.session_dir / INDEX_NAME)
+
+    def segment_audio(self, number):
+        """Memory-map one segment (0-based) without touching the others"""
+        return memmap_wav(self.session_dir / self.segments[number]['file'])
+
+    def audio(self):
+        """The last segment of the session"""
+        return self.segment_audio(len(self.segments) - 1)
+
+
+def load_session_index(session_dir):
+    """Read the segment index of a continuous recording session"""
+    with open(Path(session_dir) / INDEX_NAME) as f:
+        return json.load(f)
+
+
+class InputCapture:
+    """Records from the default input device into a FileRecorder.
+
+    The sounddevice callback only copies each block into a preallocated
+    BlockQueue; a writer thread drains the queue to the file and the ring
+    buffer, so disk I/O and the GUI never block the audio thread. Blocks
+    that find the queue full are dropped and counted, and PortAudio input
+    overflows are counted separately.
+    """
+
+    def __init__(self, recorder, block_size=BLOCK_SIZE, queue_seconds=QUEUE_SECONDS):
+        self.recorder = recorder
+        self.block_size = block_size
+        n_slots = max(4, int(queue_seconds * recorder.fs / block_size))
+        self.queue = BlockQueue(n_slots, block_size, recorder.channels)
+        self.overflows = 0
+        self.stream = None
+        self._running = False
+        self._writer = None
+
+    @property
+    def dropped_blocks(self):
+        return self.queue.overruns
+
+    def _callback(self, indata, frames, time_info, status):
+        if status.input_overflow:
+            self.overflows += 1
+        self.queue.push(indata[:, 0] if self.recorder.channels == 1 else indata)
+
+    def _drain(self):
+        while True:
+            block = self.queue.pop()
+            if block is None:
+                return
+            self.recorder.write(block)
+
+    def _write_loop(self):
+        # Poll instead of waiting on a lock the callback would have to take
+        period = self.block_size / self.recorder.fs / 2
+        while self._running:
+            self._drain()
+            time.sleep(period)
+        self._drain()
+
+    def start(self):
+        self.recorder.open()
+        self._running = True
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+        self.stream = sd.InputStream(
+            samplerate=self.recorder.fs,
+            channels=self.recorder.channels,
+            dtype='float32',
+            blocksize=self.block_size,
+            callback=self._callback
+        )
+        self.stream.start()
+
+    def stop(self):
+        """Stop capturing, flush everything queued to disk and close the file"""
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                print(f"Error stopping input stream: {e}")
+            self.stream = None
+        self._running = False
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        return self.recorder.close()
@@ -0,0 +1,129 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Fixed-size circular buffer holding the most recent audio samples.
+
+    Storage is allocated once. total_written counts every sample ever
+    written and is only updated after the data is in place, so a reader
+    in another thread can use it to know what is valid. write_started is
+    advanced before the copy (like the sequence of a seqlock): slots a
+    write in progress may be changing are already past it, so a reader
+    can tell them apart from finished data.
+    """
+
+    def __init__(self, capacity, channels=1, dtype=np.float32):
+        self.capacity = int(capacity)
+        self.channels = channels
+        shape = (self.capacity,) if channels == 1 else (self.capacity, channels)
+        self._data = np.zeros(shape, dtype=dtype)
+        self.total_written = 0
+        self.write_started = 0
+
+    def __len__(self):
+        return min(self.total_written, self.capacity)
+
+    def clear(self):
+        self.total_written = 0
+        self.write_started = 0
+
+    def write(self, block):
+        block = np.asarray(block, dtype=self._data.dtype)
+        if self.channels == 1 and block.ndim > 1:
+            block = block[:, 0]
+        n = len(block)
+        # Published before touching the data, committed in total_written after
+        self.write_started = self.total_written + n
+        if n >= self.capacity:
+            # Only the tail of a very large block fits
+            block = block[-self.capacity:]
+            start = (self.total_written + n - self.capacity) % self.capacity
+            first = self.capacity - start
+            self._data[start:] = block[:first]
+            self._data[:start] = block[first:]
+        else:
+            start = self.total_written % self.capacity
+            first = min(n, self.capacity - start)
+            self._data[start:start + first] = block[:first]
+            self._data[:n - first] = block[first:]
+        self.total_written = self.write_started
+
+    def _copy(self, seq, n):
+        """Copy n samples starting at absolute sample number seq"""
+        start = seq % self.capacity
+        if start + n <= self.capacity:
+            return self._data[start:start + n].copy()
+        return np.concatenate([self._data[start:], self._data[:start + n - self.capacity]])
+
+    def latest(self, n):
+        """Return a copy of the last n samples (fewer if not written yet), oldest first"""
+        end = self.total_written
+        n = min(int(n), end, self.capacity)
+        return self._copy(end - n, n)
+
+    def read_since(self, seq):
+        """Return (samples, next_seq, dropped) for everything written after sample number seq.
+
+        total_written works as a sequence counter: samples that were already
+        overwritten before the read, or that a write started before the copy
+        finished may have changed (a torn read), are left out and counted in
+        `dropped`. Pass next_seq back in the following call to receive every
+        sample exactly once.
+        """
+        end = self.total_written
+        start = max(seq, end - self.capacity)
+        dropped = start - seq
+        data = self._copy(start, end - start)
+
+        # A write started since `end` was read, finished or not, may have
+        # wrapped over the beginning of the copy
+        overwritten = min(self.write_started - self.capacity - start, len(data))
+        if overwritten > 0:
+            data = data[overwritten:]
+            dropped += overwritten
+        return data, end, dropped
+
+
+class BlockQueue:
+    """Single-producer/single-consumer queue of fixed-size audio blocks.
+
+    Slots are preallocated and the producer (an audio callback) never waits
+    or allocates: it copies into the next free slot and then advances
+    write_count; the consumer reads and then advances read_count. Each
+    counter is only written by one side, so no lock is needed. When all
+    slots are full the block is dropped and counted in `overruns`.
+    """
+
+    def __init__(self, n_slots, block_size, channels=1, dtype=np.float32):
+        self.n_slots = n_slots
+        self.block_size = block_size
+        shape = (n_slots, block_size) if channels == 1 else (n_slots, block_size, channels)
+        self._slots = np.zeros(shape, dtype=dtype)
+        self._lengths = np.zeros(n_slots, dtype=np.int64)
+        self.write_count = 0
+        self.read_count = 0
+        self.overruns = 0
+
+    def __len__(self):
+        return self.write_count - self.read_count
+
+    def push(self, block):
+        """Producer side; returns False if the block had to be dropped"""
+        if self.write_count - self.read_count >= self.n_slots:
+            self.overruns += 1
+            return False
+        slot = self.write_count % self.n_slots
+        n = min(len(block), self.block_size)
+        self._slots[slot, :n] = block[:n]
+        self._lengths[slot] = n
+        self.write_count += 1
+        return True
+
+    def pop(self):
+        """Consumer side; returns a copy of the oldest block or None if empty"""
+        if self.write_count == self.read_count:
+            return None
+        slot = self.read_count % self.n_slots
+        block = self._slots[slot, :self._lengths[slot]].copy()
+        self.read_count += 1
+        return block
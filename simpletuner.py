@@ -1,6 +1,6 @@
+import os
 import numpy as np
 import pyaudio
-from scipy.fft import fft
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from PyQt5.QtWidgets import (QMessageBox, QPushButton, QCheckBox, QWidget, QSlider, QVBoxLayout, QComboBox, QLabel, 
@@ -8,14 +8,34 @@ from PyQt5.QtWidgets import (QMessageBox, QPushButton, QCheckBox, QWidget, QSlid
 from PyQt5.QtCore import QTimer, Qt
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from tunerDSP import SpectrumPipeline, refine_peak
+from ringBuffer import AudioRingBuffer
+from pitchEstimation import YinDetector, yin_frame_length
+from waterfall import WaterfallView, COLUMNS as WATERFALL_COLUMNS
+from optionsSpectrogram import saved_colormap
+from config import BENCHMARK_ENV
+
+ANALYSIS_LENGTHS = (2048, 4096, 8192, 16384)
+OVERLAPS = (0.0, 0.5, 0.75, 0.875)
+
+# Target for input latency + YIN frame + compute time; the readout turns red above it
+PITCH_LATENCY_BUDGET_MS = 150
+
+# Pitch range of YIN: from a bit below the lowest note of the selected
+# instrument (PITCH_FMIN with none selected), which sets the frame length
+PITCH_FMIN = 30.0
+PITCH_FMAX = 2000.0
+PITCH_FMIN_MARGIN = 0.8   # About four semitones below the lowest string
 
 class AudioFFTVisualizer(QWidget):
     def __init__(self, master, controller):
         super().__init__(master)
         
         # Audio parameters
-        self.CHUNK = 2048 * 4  # Samples per buffer
-        self.FORMAT = pyaudio.paInt16
+        self.CHUNK = 2048 * 4  # Analysis length (samples per FFT frame)
+        self.overlap = 0.75
+        self.HOP = int(self.CHUNK * (1 - self.overlap))  # Samples per callback
+        self.FORMAT = pyaudio.paFloat32
         self.CHANNELS = 1
         self.RATE = 44100
         self.frequency_range = (20, 20000)  # Human hearing range
@@ -60,24 +80,41 @@ class AudioFFTVisualizer(QWidget):
         self.freq_markers = []  # To store reference line objects
         self.freq_labels = []   # To store text label objects
 
+        # Window, frequency vector and work buffers are reused for every frame
+        self.pipeline = SpectrumPipeline(self.CHUNK, self.RATE)
+
+        # Callbacks deliver one hop at a time into this ring buffer (single
+        # producer/single consumer). The GUI reads every new sample by sequence
+        # number into the analysis frame, whose CHUNK samples overlap by CHUNK - HOP
+        self.ring = AudioRingBuffer(2 * max(ANALYSIS_LENGTHS))
+        self.read_seq = 0
+        self.dropped_samples = 0
+        self.frame = np.zeros(self.CHUNK, dtype=np.float32)
+        self.frame_fill = 0
+        self.since_column = 0   # Samples since the last hop boundary
+
+        # Pitch is estimated in the audio callback, once per hop
+        self.configure_pitch(None)
+        self.input_latency_ms = 0.0
+        self.running = True
+
         # Setup matplotlib figure and canvas
         self.setup_ui()
 
         # Start audio stream
         self.start_audio_stream()
         
-        # Data buffers
-        self.audio_data = np.zeros(self.CHUNK)
-        self.fft_data = np.zeros(self.CHUNK//2)
-        self.running = True
-        
         # Timer for updates
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_plot)
-        self.timer.start(20)  # Update every 20ms
+        self.timer.start(16)  # ~60 fps; only the two lines are redrawn (blitting)
 
     def show_no_microphone_warning(self):
         """Show a warning message when no microphone is available"""
+        if os.environ.get(BENCHMARK_ENV):
+            # A modal box would block an unattended benchmark run
+            print("No audio input devices found")
+            return
         msg = QMessageBox()
         msg.setIcon(QMessageBox.Warning)
         msg.setText("No audio input devices found")
@@ -164,7 +201,41 @@ class AudioFFTVisualizer(QWidget):
         # Log/linear frequency scale checkbox
         self.log_freq_checkbox = QCheckBox("Linear Frequency")
         self.log_freq_checkbox.setChecked(False)
-        self.log_freq_checkbox.stateChanged.connect(self.update_plot)
+        self.log_freq_checkbox.stateChanged.connect(self.apply_frequency_scale)
+
+        # Analysis length and overlap between consecutive frames
+        self.length_label = QLabel("Length:")
+        self.length_dropdown = QComboBox()
+        for length in ANALYSIS_LENGTHS:
+            self.length_dropdown.addItem(f"{length} ({1000 * length / self.RATE:.0f} ms)", length)
+        self.length_dropdown.setCurrentIndex(ANALYSIS_LENGTHS.index(self.CHUNK))
+        self.length_dropdown.currentIndexChanged.connect(self.change_analysis)
+
+        self.overlap_label = QLabel("Overlap:")
+        self.overlap_dropdown = QComboBox()
+        for overlap in OVERLAPS:
+            self.overlap_dropdown.addItem(f"{100 * overlap:g}%", overlap)
+        self.overlap_dropdown.setCurrentIndex(OVERLAPS.index(self.overlap))
+        self.overlap_dropdown.currentIndexChanged.connect(self.change_analysis)
+
+        # Detected note, cents offset and confidence (YIN)
+        self.note_label = QLabel("--")
+        self.note_label.setMinimumWidth(220)
+        self.note_label.setStyleSheet("font-size: 20px; font-weight: bold;")
+        self.latency_label = QLabel("Latency: --")
+        self.dropped_label = QLabel("Dropped: 0 samples")
+
+        # Strongest peak, refined between bins
+        self.peak_label = QLabel("Peak: --")
+        self.peak_label.setMinimumWidth(170)
+
+        # Scrolling spectrogram, one column per hop
+        self.waterfall_checkbox = QCheckBox("Waterfall")
+        self.waterfall_checkbox.toggled.connect(self.toggle_waterfall)
+
+        # Time spent computing the spectrum of the last frame
+        self.compute_label = QLabel("DSP: -- ms")
+        self.compute_label.setMinimumWidth(90)
         
         # Add widgets to control panel
         control_layout.addWidget(self.device_label)
@@ -174,17 +245,35 @@ class AudioFFTVisualizer(QWidget):
         control_layout.addWidget(self.offset_label)
         control_layout.addWidget(self.offset_slider)
         control_layout.addWidget(self.log_freq_checkbox)
+        control_layout.addWidget(self.waterfall_checkbox)
+        control_layout.addWidget(self.length_label)
+        control_layout.addWidget(self.length_dropdown)
+        control_layout.addWidget(self.overlap_label)
+        control_layout.addWidget(self.overlap_dropdown)
 
         control_layout.addWidget(self.instrument_label)
         control_layout.addWidget(self.instrument_dropdown)
         control_layout.addWidget(self.reset_button)
+        control_layout.addWidget(self.peak_label)
+        control_layout.addWidget(self.compute_label)
         
         # Add stretch to push controls left
         control_layout.addStretch()
+
+        pitch_panel = QWidget()
+        pitch_layout = QHBoxLayout(pitch_panel)
+        pitch_layout.addWidget(self.note_label)
+        pitch_layout.addWidget(self.latency_label)
+        pitch_layout.addWidget(self.dropped_label)
+        pitch_layout.addStretch()
         
         # Add widgets to main layout
+        main_layout.addWidget(pitch_panel)
         main_layout.addWidget(self.toolbar)
         main_layout.addWidget(self.canvas)
+        self.waterfall = WaterfallView(self.RATE, self.CHUNK, saved_colormap(), self)
+        self.waterfall.setVisible(False)
+        main_layout.addWidget(self.waterfall)
         main_layout.addWidget(control_panel)
         
         # Setup plots
@@ -206,11 +295,12 @@ class AudioFFTVisualizer(QWidget):
                 rate=self.RATE,
                 input=True,
                 output=False,
-                frames_per_buffer=self.CHUNK,
+                frames_per_buffer=self.HOP,
                 input_device_index=device_index,
                 stream_callback=self.audio_callback
             )
             self.current_device_index = device_index
+            self.input_latency_ms = 1000 * self.stream.get_input_latency()
             print(f"Stream started with device index: {device_index if device_index else 'default'}")
         except Exception as e:
             print(f"Error opening stream: {e}")
@@ -218,6 +308,9 @@ class AudioFFTVisualizer(QWidget):
 
     def show_stream_error_message(self, error_details):
         """Show an error message when stream fails to open"""
+        if os.environ.get(BENCHMARK_ENV):
+            print(f"Failed to open audio stream: {error_details}")
+            return
         msg = QMessageBox()
         msg.setIcon(QMessageBox.Critical)
         msg.setText("Failed to open audio stream")
@@ -232,10 +325,18 @@ class AudioFFTVisualizer(QWidget):
         self.zoom_slider.setValue(60)
         self.offset_slider.setValue(0)
         self.log_freq_checkbox.setChecked(False)
-        self.update_plot()
+        self.apply_frequency_scale()
+
+    def configure_pitch(self, instrument_name):
+        """Size the YIN frame for the lowest note of the instrument (or PITCH_FMIN)"""
+        frequencies = self.instrument_frequencies.get(instrument_name)
+        fmin = PITCH_FMIN_MARGIN * min(frequencies) if frequencies else PITCH_FMIN
+        # Swapped in one assignment; the audio callback picks it up on its next block
+        self.yin = YinDetector(self.RATE, yin_frame_length(self.RATE, fmin), fmin, PITCH_FMAX)
 
     def update_instrument_markers(self, instrument_name):
         """Update the frequency reference lines based on selected instrument"""
+        self.configure_pitch(instrument_name)
         # Clear existing markers and labels
         for marker in self.freq_markers:
             marker.remove()
@@ -320,32 +421,77 @@ class AudioFFTVisualizer(QWidget):
         
         # Waveform plot
         self.x_wave = np.arange(0, self.CHUNK)
-        self.line_wave, = self.ax_wave.plot(self.x_wave, np.zeros(self.CHUNK), 'b')
+        self.line_wave, = self.ax_wave.plot(self.x_wave, np.zeros(self.CHUNK), 'b', animated=True)
         self.ax_wave.set_title('Time Domain - Microphone Input')
         self.ax_wave.set_xlim(0, self.CHUNK)
         self.ax_wave.set_ylim(-1, 1)
         self.ax_wave.set_ylabel('Amplitude')
         self.ax_wave.grid(True)
         
-        # FFT plot initialization
-        freqs = np.fft.rfftfreq(self.CHUNK, 1 / self.RATE)
-        self.line_fft, = self.ax_fft.semilogx(freqs, np.zeros_like(freqs), 'r')
-        
-        self.setup_log_ticks()
+        # FFT plot initialization, starting at the floor of the dB range
+        freqs = self.pipeline.freqs
+        max_offset = self.offset_slider.maximum()
+        floor_db = -60 - max_offset
+        self.line_fft, = self.ax_fft.semilogx(freqs, np.full_like(freqs, floor_db), 'r', animated=True)
 
         self.ax_fft.set_title('Frequency Domain - FFT Analysis')
-        self.ax_fft.set_xlim(*self.frequency_range)
-        self.ax_fft.set_ylim(-self.zoom_level, 0)
+        self.ax_fft.set_ylim(floor_db, 0 + max_offset)
         self.ax_fft.set_xlabel('Frequency (Hz)')
         self.ax_fft.set_ylabel('Magnitude (dB)')
         self.ax_fft.grid(True, which='both')
 
-    def update_zoom_level(self, value):
-        """Update the zoom level (dB range) for the FFT plot"""
-        self.zoom_level = value
-        self.ax_fft.set_ylim(-self.zoom_level, 0)
+        # Axes, ticks and layout are static: they are drawn into the cached
+        # background and only the lines are redrawn on every frame
+        self.background = None
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.apply_frequency_scale()
+
+    def apply_frequency_scale(self):
+        """Switch between log and linear frequency axes (full redraw, once)"""
+        if self.log_freq_checkbox.isChecked():
+            self.ax_fft.set_xscale("linear")
+            self.ax_fft.set_xlim(0, self.RATE / 2)
+            self.ax_fft.xaxis.set_major_formatter(plt.ScalarFormatter())
+            self.ax_fft.xaxis.set_major_locator(plt.MaxNLocator(10))
+            self.ax_fft.xaxis.set_minor_locator(plt.NullLocator())
+            self.figure.tight_layout()
+        else:
+            self.ax_fft.set_xscale("log")
+            self.ax_fft.set_xlim(*self.frequency_range)
+            self.setup_log_ticks()
         self.canvas.draw()
 
+    def on_draw(self, event):
+        """Cache the static background after every full draw (resize, zoom, markers)"""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_lines()
+
+    def draw_lines(self):
+        self.ax_wave.draw_artist(self.line_wave)
+        self.ax_fft.draw_artist(self.line_fft)
+
+    def change_analysis(self):
+        """Apply a new analysis length/overlap: new pipeline, plot extents and callback size"""
+        self.CHUNK = self.length_dropdown.currentData()
+        self.overlap = self.overlap_dropdown.currentData()
+        self.HOP = int(self.CHUNK * (1 - self.overlap))
+        self.pipeline = SpectrumPipeline(self.CHUNK, self.RATE)
+        self.frame = np.zeros(self.CHUNK, dtype=np.float32)
+        self.frame_fill = 0
+        self.since_column = 0
+        self.waterfall.set_fft_size(self.CHUNK)
+        if self.waterfall.isVisible():
+            self.waterfall.draw()
+
+        self.x_wave = np.arange(0, self.CHUNK)
+        self.line_wave.set_data(self.x_wave, np.zeros(self.CHUNK))
+        self.ax_wave.set_xlim(0, self.CHUNK)
+        self.line_fft.set_data(self.pipeline.freqs,
+                               np.full_like(self.pipeline.freqs, self.ax_fft.get_ylim()[0]))
+        self.canvas.draw()
+
+        self.start_audio_stream(self.current_device_index)
+
     def change_device(self, index):
         """Handle device selection change"""
         device_index = self.device_dropdown.itemData(index)
@@ -365,11 +511,12 @@ class AudioFFTVisualizer(QWidget):
                 rate=self.RATE,
                 input=True,
                 output=False,
-                frames_per_buffer=self.CHUNK,
+                frames_per_buffer=self.HOP,
                 input_device_index=device_index,
                 stream_callback=self.audio_callback
             )
             self.current_device_index = device_index
+            self.input_latency_ms = 1000 * self.stream.get_input_latency()
             print(f"Stream started with device index: {device_index if device_index else 'default'}")
         except Exception as e:
             print(f"Error opening stream: {e}")
@@ -377,7 +524,10 @@ class AudioFFTVisualizer(QWidget):
     def audio_callback(self, in_data, frame_count, time_info, status):
         """Callback function for audio stream"""
         if self.running:
-            self.audio_data = np.frombuffer(in_data, dtype=np.int16) / 32768.0
+            # paFloat32 input: use the bytes as they are, the ring buffer copies them
+            samples = np.frombuffer(in_data, dtype=np.float32)
+            self.ring.write(samples)
+            self.yin.process(samples)
         return (in_data, pyaudio.paContinue)
 
     def setup_log_ticks(self):
@@ -443,49 +593,104 @@ class AudioFFTVisualizer(QWidget):
 
     def update_plot(self):
         """Update the plots with new audio data"""
-        if not self.running or not hasattr(self, 'audio_data'):
+        if not self.running:
             return
 
-        # Apply zoom/gain to the raw audio data
+        # Take every sample written since the last tick; anything the callback
+        # overwrote before we got to it is counted, not silently lost
+        new, self.read_seq, dropped = self.ring.read_since(self.read_seq)
+        if dropped:
+            self.dropped_samples += dropped
+            self.dropped_label.setText(f"Dropped: {self.dropped_samples} samples")
+        if len(new) == 0:
+            return
+        gap = dropped > 0
+        if self.waterfall.isVisible() and len(new) > WATERFALL_COLUMNS * self.HOP:
+            # After a long stall only the last screenful gets a column
+            new = new[-WATERFALL_COLUMNS * self.HOP:]
+            gap = True
+        if gap:
+            # Samples before the gap must not share a frame with those after
+            # it, and the hop grid starts again at the first new sample
+            self.frame_fill = 0
+            self.since_column = 0
+        # Apply zoom/gain to the raw audio data and compute Hann-windowed spectra
         zoom_factor = self.zoom_level / 60.0
-        processed_audio = self.audio_data * zoom_factor
+        offset = self.offset_slider.value()
+        mag_db = None
+
+        if self.waterfall.isVisible():
+            # One column per hop
+            while len(new):
+                take = min(self.HOP - self.since_column, len(new))
+                self.push_frame(new[:take])
+                new = new[take:]
+                self.since_column = (self.since_column + take) % self.HOP
+                if self.since_column == 0 and self.frame_fill == self.CHUNK:
+                    mag_db = self.pipeline.process(self.frame, zoom_factor, offset)
+                    self.waterfall.add_column(mag_db)
+            self.waterfall.refresh()
+        else:
+            self.push_frame(new)
 
-        # Update waveform plot
-        self.line_wave.set_ydata(processed_audio)
-        self.ax_wave.set_ylim(-1, 1)
+        if self.frame_fill < self.CHUNK:
+            return
+        # The spectrum plot shows the newest frame, even between hop boundaries
+        if mag_db is None or self.since_column:
+            mag_db = self.pipeline.process(self.frame, zoom_factor, offset)
+        self.compute_label.setText(f"DSP: {self.pipeline.compute_ms:.2f} ms")
 
-        # Compute FFT with Hann window
-        window = np.hanning(len(processed_audio))
-        yf = fft(processed_audio * window)
-        mag_lin = 2 / self.CHUNK * np.abs(yf[:len(yf)//2 + 1])
-        mag_db = 20 * np.log10(mag_lin + 1e-8) + self.offset_slider.value()
+        peak_freq, peak_db = refine_peak(mag_db, self.pipeline.freqs, *self.frequency_range)
+        if np.isfinite(peak_freq):
+            self.peak_label.setText(f"Peak: {peak_freq:.2f} Hz ({peak_db:.1f} dB)")
 
-        # Update FFT line data
-        freqs = np.fft.rfftfreq(self.CHUNK, 1 / self.RATE)
-        min_length = min(len(freqs), len(mag_db))
-        self.line_fft.set_data(freqs[:min_length], mag_db[:min_length])
+        self.update_pitch_readout()
 
-        # Handle scale type
-        if self.log_freq_checkbox.isChecked():
-            self.ax_fft.set_xscale("linear")
-            self.ax_fft.set_xlim(0, self.RATE / 2)
-            self.ax_fft.xaxis.set_major_formatter(plt.ScalarFormatter())
-            self.ax_fft.xaxis.set_major_locator(plt.MaxNLocator(10))
+        # Update waveform and FFT lines
+        self.line_wave.set_ydata(self.pipeline.scaled)
+        self.line_fft.set_data(self.pipeline.freqs, mag_db)
+
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_lines()
+        self.canvas.blit(self.figure.bbox)
+
+    def toggle_waterfall(self, checked):
+        """Show or hide the waterfall, picking up the current colormap preference"""
+        if checked:
+            self.waterfall.im.set_cmap(saved_colormap())
+            self.waterfall.clear()
+            self.since_column = 0
+        self.waterfall.setVisible(checked)
+        if checked:
+            self.waterfall.draw()
+
+    def push_frame(self, new):
+        """Slide new samples into the analysis frame"""
+        n = len(new)
+        if n >= self.CHUNK:
+            self.frame[:] = new[-self.CHUNK:]
         else:
-            self.ax_fft.set_xscale("log")
-            self.ax_fft.set_xlim(*self.frequency_range)  # Reset to original frequency range
-            self.setup_log_ticks()  # Reapply our custom log ticks
-                    
-        # Remove any zero lines (including red line)
-        for line in self.ax_fft.lines:
-            if len(line.get_ydata()) > 0 and np.all(line.get_ydata() == 0):
-                line.remove()
-
-        # Adjust y-limits
-        max_offset = self.offset_slider.maximum()
-        self.ax_fft.set_ylim(-60 - max_offset, 0 + max_offset)
+            self.frame[:-n] = self.frame[n:]
+            self.frame[-n:] = new
+        self.frame_fill = min(self.CHUNK, self.frame_fill + n)
+
+    def update_pitch_readout(self):
+        """Show the latest YIN result and the latency it carries"""
+        result = self.yin.result
+        if np.isfinite(result['frequency']):
+            self.note_label.setText(f"{result['note']} {result['cents']:+.1f}¢  "
+                                    f"{result['frequency']:.2f} Hz  (conf {result['confidence']:.2f})")
+        else:
+            self.note_label.setText("--")
 
-        self.canvas.draw()
+        # Capture latency, half the YIN frame (its centre) and the analysis itself
+        total = self.input_latency_ms + self.yin.analysis_ms / 2 + self.yin.compute_ms
+        self.latency_label.setText(f"Latency: {total:.0f} ms (input {self.input_latency_ms:.0f}, "
+                                   f"frame {self.yin.analysis_ms / 2:.0f}, YIN {self.yin.compute_ms:.2f})")
+        self.latency_label.setStyleSheet("color: red;" if total > PITCH_LATENCY_BUDGET_MS else "")
 
     def update_zoom_level(self, value):
         """Update the zoom/gain level (1.0 = normal)"""
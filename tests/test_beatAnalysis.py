@@ -0,0 +1,31 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('scipy.signal')
+
+from beatAnalysis import spectral_partials, estimate_beats
+
+FS = 8000
+
+
+def tones(freqs, seconds=4.0, amplitudes=None):
+    t = np.arange(int(seconds * FS)) / FS
+    amplitudes = amplitudes or [1.0] * len(freqs)
+    return sum(a * np.sin(2 * np.pi * f * t) for a, f in zip(amplitudes, freqs))
+
+
+def test_spectral_partials_refines_several_peaks():
+    freqs = [220.3, 440.1, 443.1]
+    partials, levels = spectral_partials(tones(freqs), FS)
+    assert len(partials) == len(freqs)
+    np.testing.assert_allclose(partials, freqs, atol=0.05)
+    assert np.ptp(levels) < 1.0
+
+
+def test_two_tones_beat_at_their_difference():
+    result = estimate_beats(tones([440.0, 443.0]), FS)
+    rate, strength = result['beats'][0]
+    assert rate == pytest.approx(3.0, abs=0.05)
+    assert strength == 1.0
+    assert any(low == pytest.approx(440.0, abs=0.1) and high == pytest.approx(443.0, abs=0.1)
+               for low, high, _, _ in result['pairs'])
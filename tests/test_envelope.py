@@ -0,0 +1,29 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('scipy.signal')
+
+from envelope import moving_average, minmax_decimate, decimate_for_display
+
+
+@pytest.mark.parametrize('n', [1, 4, 7, 50])
+def test_moving_average_matches_convolve(n):
+    x = np.random.default_rng(0).standard_normal(1000)
+    np.testing.assert_allclose(moving_average(x, n), np.convolve(x, np.ones(n) / n, mode='same'),
+                               atol=1e-12)
+
+
+def test_minmax_decimate_keeps_block_extremes():
+    x = np.arange(103, dtype=float)
+    out = minmax_decimate(x, 10)
+    assert len(out) == 20
+    # The first 103 % 10 samples are dropped
+    assert out[0] == 3 and out[-1] == 102
+
+
+def test_decimate_for_display_times_follow_values():
+    times = np.linspace(0, 1, 10001)
+    values = np.sin(2 * np.pi * 5 * times)
+    t, v = decimate_for_display(times, values, columns=100)
+    assert len(t) == len(v) == 200
+    assert t[-1] == times[-1]
@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+signal = pytest.importorskip('scipy.signal')
+
+from filterDesign import design_sos
+from fftFilter import design_fir, filter_signal, filter_file, fir_filter
+
+FS = 44100
+EDGES = {'fcut1': 500, 'fcut2': 2000}
+
+
+def noise(n=30000, channels=None, seed=0):
+    shape = (n,) if channels is None else (n, channels)
+    return np.random.default_rng(seed).standard_normal(shape)
+
+
+def test_iir_engine_filters_like_sosfilt():
+    x = noise()
+    out, engine = filter_signal(x, FS, 'Bandpass', 10, engine='IIR (SOS)', **EDGES)
+    assert engine == 'iir'
+    sos = design_sos('Bandpass', FS, 10, **EDGES)
+    np.testing.assert_allclose(out, signal.sosfilt(sos, x))
+
+
+def test_auto_engine_output_matches_its_choice():
+    x = noise()
+    out, engine = filter_signal(x, FS, 'Lowpass', 10, engine='Auto', fcut=1000)
+    if engine == 'iir':
+        expected = signal.sosfilt(design_sos('Lowpass', FS, 10, fcut=1000), x)
+    else:
+        expected = np.convolve(x, design_fir('Lowpass', FS, 10, fcut=1000))[:len(x)]
+    np.testing.assert_allclose(out, expected, atol=1e-9)
+
+
+def test_fir_engine_matches_direct_convolution():
+    x = noise(5000)
+    taps = design_fir('Highpass', FS, 20, fcut=2000)
+    np.testing.assert_allclose(fir_filter(taps, x, block_size=1024),
+                               np.convolve(x, taps)[:len(x)], atol=1e-9)
+
+
+def test_filter_file_iir(tmp_path):
+    sf = pytest.importorskip('soundfile')
+    x = 0.1 * noise(20000, channels=2)
+    src = tmp_path / 'in.wav'
+    dst = tmp_path / 'out.wav'
+    sf.write(src, x, FS, subtype='FLOAT')
+
+    engine = filter_file(src, dst, 'Bandpass', 10, engine='IIR (SOS)', block_size=4096, **EDGES)
+    assert engine == 'iir'
+
+    written, _ = sf.read(dst)
+    stored, _ = sf.read(src)
+    expected = signal.sosfilt(design_sos('Bandpass', FS, 10, **EDGES), stored, axis=0)
+    np.testing.assert_allclose(written, expected, atol=1e-6)
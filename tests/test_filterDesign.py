@@ -0,0 +1,34 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+signal = pytest.importorskip('scipy.signal')
+
+from filterDesign import design_sos, apply_sos
+
+FS = 44100
+
+
+def noise(n=20000, seed=0):
+    return np.random.default_rng(seed).standard_normal(n)
+
+
+def test_design_sos_returns_a_writable_copy():
+    first = design_sos('Lowpass', FS, 10, fcut=1000)
+    second = design_sos('Lowpass', FS, 10, fcut=1000)
+    assert first.flags.writeable
+    assert first is not second
+    first[:] = 0
+    assert np.any(design_sos('Lowpass', FS, 10, fcut=1000))
+
+
+def test_apply_sos_matches_sosfilt():
+    sos = design_sos('Bandpass', FS, 10, fcut1=500, fcut2=2000)
+    x = noise()
+    np.testing.assert_allclose(apply_sos(sos, x, block_size=4096), signal.sosfilt(sos, x))
+
+
+def test_apply_sos_zero_phase_runs_on_cached_design():
+    sos = design_sos('Highpass', FS, 10, fcut=300)
+    out = apply_sos(sos, noise(), zero_phase=True)
+    assert out.shape == (20000,)
+    assert np.all(np.isfinite(out))
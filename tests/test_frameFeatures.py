@@ -0,0 +1,27 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from frameFeatures import short_time_energy_db, spectral_centroid
+
+FS = 8000
+
+
+def test_batched_frames_match_single_frames():
+    frames = np.random.default_rng(0).standard_normal((5, 256)) * np.hanning(256)
+    ste = short_time_energy_db(frames)
+    centroid = spectral_centroid(frames, FS, 1024)
+    for i, frame in enumerate(frames):
+        assert ste[i] == pytest.approx(10 * np.log10(np.mean(frame ** 2) + 1e-12))
+        assert centroid[i] == pytest.approx(float(spectral_centroid(frame, FS, 1024)))
+
+
+def test_centroid_of_a_tone_is_its_frequency():
+    t = np.arange(1024) / FS
+    frame = np.sin(2 * np.pi * 1000 * t) * np.hanning(1024)
+    assert float(spectral_centroid(frame, FS)) == pytest.approx(1000, rel=0.01)
+
+
+def test_silent_frame():
+    assert np.isnan(spectral_centroid(np.zeros(64), FS))
+    assert short_time_energy_db(np.zeros(64)) == pytest.approx(-120)
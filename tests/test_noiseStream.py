@@ -0,0 +1,29 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('scipy.signal')
+
+from noiseStream import ColoredNoiseStream
+
+FS = 44100
+SECONDS = 4
+
+
+def rms(x):
+    return np.sqrt(np.mean(np.square(x, dtype=np.float64)))
+
+
+@pytest.mark.parametrize('noise_type', ColoredNoiseStream.NOISE_TYPES)
+def test_streamed_and_rendered_noise_have_the_same_level(noise_type):
+    amplitude = 0.5
+    streamed = np.concatenate(list(ColoredNoiseStream(noise_type, FS, amplitude, seed=1)
+                                   .blocks(SECONDS * FS)))
+    rendered = ColoredNoiseStream(noise_type, FS, amplitude, seed=2).render(SECONDS)
+
+    assert len(streamed) == len(rendered)
+    # Within 1 dB of each other and of the nominal level
+    assert 20 * np.log10(rms(streamed) / rms(rendered)) == pytest.approx(0, abs=1)
+    assert 20 * np.log10(rms(rendered) / (amplitude / ColoredNoiseStream.CREST_FACTOR)) == \
+        pytest.approx(0, abs=1)
+    assert np.max(np.abs(streamed)) <= amplitude
+    assert np.max(np.abs(rendered)) <= amplitude
@@ -0,0 +1,19 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('scipy.signal')
+
+from pitchEstimation import YinDetector, yin_frame_length
+
+FS = 44100
+
+
+@pytest.mark.parametrize('fmin', [22.0, 65.9, 150.0])
+def test_frame_sized_from_fmin_detects_the_lowest_pitch(fmin):
+    frame = yin_frame_length(FS, fmin)
+    yin = YinDetector(FS, frame, fmin, 2000.0)
+    assert yin.max_lag >= FS / fmin
+
+    f0 = 1.05 * fmin
+    yin.process(np.sin(2 * np.pi * f0 * np.arange(frame) / FS))
+    assert yin.result['frequency'] == pytest.approx(f0, rel=0.01)
@@ -0,0 +1,79 @@
+import sys
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from ringBuffer import AudioRingBuffer
+
+CAPACITY = 1000
+BLOCK = 900   # Each write overwrites most of the ring, so a lagging read overlaps it
+
+
+class YieldingArray(np.ndarray):
+    """Ring storage that hands the GIL to the reader after every partial copy"""
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        time.sleep(1e-5)
+
+
+def check_read(seq, data, next_seq, dropped):
+    """Every sample holds its own sequence number, so a torn sample shows up as a mismatch"""
+    first = seq + dropped
+    assert next_seq - first == len(data)
+    np.testing.assert_array_equal(data, np.arange(first, next_seq))
+
+
+def test_read_since_counts_overwritten_samples():
+    ring = AudioRingBuffer(CAPACITY, dtype=np.float64)
+    ring.write(np.arange(2500))
+    data, next_seq, dropped = ring.read_since(0)
+    assert dropped == 1500
+    check_read(0, data, next_seq, dropped)
+
+
+def test_read_since_skips_slots_of_a_write_in_progress():
+    ring = AudioRingBuffer(CAPACITY, dtype=np.float64)
+    ring.write(np.arange(CAPACITY))
+    # A writer has announced the next block but not committed it yet
+    ring.write_started = ring.total_written + BLOCK
+    ring._data[:BLOCK // 2] = -1
+    data, next_seq, dropped = ring.read_since(0)
+    assert next_seq == CAPACITY and dropped == BLOCK
+    check_read(0, data, next_seq, dropped)
+
+
+def test_concurrent_reader_never_accepts_a_torn_block():
+    ring = AudioRingBuffer(CAPACITY, dtype=np.float64)
+    ring._data = ring._data.view(YieldingArray)
+    n_blocks = 200
+    errors = []
+
+    def writer():
+        for i in range(n_blocks):
+            ring.write(np.arange(i * BLOCK, (i + 1) * BLOCK, dtype=np.float64))
+
+    def reader():
+        seq = 0
+        try:
+            while seq < n_blocks * BLOCK:
+                data, next_seq, dropped = ring.read_since(seq)
+                check_read(seq, data, next_seq, dropped)
+                seq = next_seq
+        except AssertionError as e:
+            errors.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)  # Switch threads as often as possible
+    try:
+        threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+    finally:
+        sys.setswitchinterval(interval)
+    assert not errors, errors[0]
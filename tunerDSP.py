@@ -0,0 +1,75 @@
+import inspect
+import time
+
+import numpy as np
+
+from pitchEstimation import parabolic_peak
+
+# numpy >= 2.0 can write the FFT straight into a preallocated array
+_RFFT_HAS_OUT = 'out' in inspect.signature(np.fft.rfft).parameters
+
+DB_FLOOR = 1e-8
+
+
+class SpectrumPipeline:
+    """Windowed magnitude spectrum (dB) of fixed-size frames with no per-frame allocation.
+
+    The window, the frequency vector and every work buffer are created once
+    for a given frame length and sample rate and reused for every frame, all
+    in float32. compute_ms holds the time spent in the last process() call.
+    """
+
+    def __init__(self, n_fft, fs):
+        self.n_fft = n_fft
+        self.fs = fs
+        self.window = np.hanning(n_fft).astype(np.float32)
+        self.freqs = np.fft.rfftfreq(n_fft, 1 / fs).astype(np.float32)
+        self.scale = np.float32(2 / n_fft)
+
+        self.scaled = np.zeros(n_fft, dtype=np.float32)      # Input times gain (for display)
+        self._frame = np.zeros(n_fft, dtype=np.float32)      # Windowed input
+        self._spectrum = np.zeros(n_fft // 2 + 1, dtype=np.complex64)
+        self.mag_db = np.zeros(n_fft // 2 + 1, dtype=np.float32)
+        self.compute_ms = 0.0
+
+    def _rfft(self):
+        if _RFFT_HAS_OUT:
+            return np.fft.rfft(self._frame, out=self._spectrum)
+        self._spectrum[:] = np.fft.rfft(self._frame)
+        return self._spectrum
+
+    def process(self, samples, gain=1.0, offset_db=0.0):
+        """Return the dB spectrum of one frame (an internal buffer, valid until the next call)"""
+        start = time.perf_counter()
+
+        np.multiply(samples, np.float32(gain), out=self.scaled)
+        np.multiply(self.scaled, self.window, out=self._frame)
+        spectrum = self._rfft()
+
+        mag = self.mag_db
+        np.abs(spectrum, out=mag)
+        mag *= self.scale
+        mag += np.float32(DB_FLOOR)
+        np.log10(mag, out=mag)
+        mag *= np.float32(20)
+        mag += np.float32(offset_db)
+
+        self.compute_ms = (time.perf_counter() - start) * 1000
+        return mag
+
+
+def refine_peak(mag_db, freqs, fmin, fmax):
+    """Strongest spectral peak in [fmin, fmax] with sub-bin accuracy.
+
+    A parabola through the dB magnitudes of the peak bin and its two
+    neighbours locates the maximum between bins; with a Hann window this
+    is accurate to a small fraction of a bin. Returns (frequency, level_db).
+    """
+    lo = max(1, int(np.searchsorted(freqs, fmin)))
+    hi = min(len(freqs) - 1, int(np.searchsorted(freqs, fmax, side='right')))
+    if hi <= lo:
+        return np.nan, np.nan
+    index = lo + int(np.argmax(mag_db[lo:hi]))
+    position, level = parabolic_peak(mag_db[None, :], np.array([index]))
+    bin_width = freqs[1] - freqs[0]
+    return float(freqs[0] + position[0] * bin_width), float(level[0])
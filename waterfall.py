@@ -0,0 +1,84 @@
+import numpy as np
+import matplotlib
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+COLUMNS = 300       # STFT columns visible at once
+ROWS = 256          # Log-spaced frequency rows
+FREQ_MIN = 20
+DB_RANGE = (-100, 0)
+
+
+class WaterfallView(FigureCanvas):
+    """Scrolling spectrogram of a live input with constant memory.
+
+    Columns go into a circular image buffer twice as wide as the display:
+    column i is stored at i and i + COLUMNS, so the last COLUMNS columns are
+    always one contiguous slice and no data is ever shifted or reallocated.
+    Only the image is redrawn, blitted over a cached background.
+    """
+
+    def __init__(self, fs, n_fft, cmap='viridis', parent=None):
+        self.fig = Figure(figsize=(12, 3))
+        super().__init__(self.fig)
+        self.setParent(parent)
+        self.fs = fs
+
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_title('Waterfall')
+        self.ax.set_xlabel('Columns (newest on the right)')
+        self.ax.set_ylabel('Frequency (Hz)')
+
+        self._image = np.full((ROWS, 2 * COLUMNS), DB_RANGE[0], dtype=np.float32)
+        self._position = 0
+        if cmap not in matplotlib.colormaps:
+            cmap = 'viridis'
+        self.im = self.ax.imshow(self.visible(), origin='lower', aspect='auto', cmap=cmap,
+                                 vmin=DB_RANGE[0], vmax=DB_RANGE[1], interpolation='nearest',
+                                 extent=(-COLUMNS, 0, 0, ROWS), animated=True)
+        self.set_fft_size(n_fft)
+
+        self._background = None
+        self.mpl_connect('draw_event', self.on_draw)
+
+    def set_fft_size(self, n_fft):
+        """Map FFT bins to log-spaced rows (max of the bins in each row)"""
+        freqs = np.fft.rfftfreq(n_fft, 1 / self.fs)
+        edges_hz = np.geomspace(FREQ_MIN, self.fs / 2, ROWS + 1)[:-1]
+        # Rows narrower than a bin repeat the nearest bin (reduceat on equal indices)
+        self._row_start = np.clip(np.searchsorted(freqs, edges_hz), 1, len(freqs) - 1)
+
+        ticks = [f for f in (50, 100, 200, 500, 1000, 2000, 5000, 10000) if f < self.fs / 2]
+        rows = np.log(np.array(ticks) / FREQ_MIN) / np.log(self.fs / 2 / FREQ_MIN) * ROWS
+        self.ax.set_yticks(rows)
+        self.ax.set_yticklabels([f"{f // 1000}k" if f >= 1000 else str(f) for f in ticks])
+        self.clear()
+
+    def visible(self):
+        return self._image[:, self._position:self._position + COLUMNS]
+
+    def clear(self):
+        self._image.fill(DB_RANGE[0])
+        self._position = 0
+
+    def add_column(self, mag_db):
+        # Max over the bins of every row, without a Python loop
+        column = np.maximum.reduceat(mag_db, self._row_start)
+
+        self._image[:, self._position] = column
+        self._image[:, self._position + COLUMNS] = column
+        self._position = (self._position + 1) % COLUMNS
+
+    def on_draw(self, event):
+        self._background = self.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self.im)
+
+    def refresh(self):
+        """Show the columns added since the last refresh"""
+        self.im.set_data(self.visible())
+        if self._background is None:
+            self.draw()
+            return
+        self.restore_region(self._background)
+        self.ax.draw_artist(self.im)
+        self.blit(self.fig.bbox)